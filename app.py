@@ -0,0 +1,395 @@
+"""
+Heart Disease Prediction - Inference API
+Flask service exposing the trained ensemble over HTTP
+
+Routes:
+    GET  /health            - service and model status
+    GET  /api/feature-info  - feature metadata for clients
+    POST /api/predict       - score one patient (JSON object); ?plot=png|svg|json
+                              picks the explanation chart format
+    POST /api/predict/batch - score many patients (JSON array or NDJSON),
+                              results streamed back as NDJSON
+    GET  /api/explain/<id>  - explanation computed in the background (SHAP_ASYNC)
+    GET  /metrics           - request latency percentiles and batching stats (this worker)
+
+Development:  python app.py
+Production:   gunicorn -c gunicorn.conf.py app:app
+"""
+
+import json
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import numpy as np
+from flask import Flask, Response, g, jsonify, request, stream_with_context
+
+from chart_rendering import CHART_FORMATS, chart_cache, render_contributions
+from explanations import ExplanationEngine
+from inference import risk_levels, score_patients
+from micro_batcher import MicroBatcher
+from model_loader import FEATURE_INFO_PATH, load_model_bundle
+from settings import SETTINGS
+from validation import error_messages, validate_records
+
+warnings.filterwarnings('ignore')
+
+# ===============================
+# Configuration
+# ===============================
+MODEL_PATH = SETTINGS.get('MODEL_PATH', 'heart_model.pkl')
+SCALER_PATH = SETTINGS.get('SCALER_PATH', 'scaler.pkl')
+SERVING_MODEL = SETTINGS.get('SERVING_MODEL', 'ensemble')  # 'ensemble' or 'student'
+STUDENT_MODEL_PATH = SETTINGS.get('STUDENT_MODEL_PATH', 'heart_model_student.npz')
+# Score from the compiled arrays only, never from the unpickled scikit-learn/XGBoost models
+COMPILED_ONLY = SETTINGS.get('COMPILED_ONLY', False)
+LATENCY_WINDOW = SETTINGS.get('LATENCY_WINDOW', 10000)
+MICRO_BATCHING = SETTINGS.get('MICRO_BATCHING', True)
+BATCH_WINDOW_MS = SETTINGS.get('BATCH_WINDOW_MS', 2)
+BATCH_MAX_SIZE = SETTINGS.get('BATCH_MAX_SIZE', 256)
+BATCH_CHUNK_SIZE = SETTINGS.get('BATCH_CHUNK_SIZE', 1000)
+BATCH_SCORING_THREADS = SETTINGS.get('BATCH_SCORING_THREADS', 2)
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl')
+SHAP_ENABLED = SETTINGS.get('SHAP_ENABLED', True)
+SHAP_ASYNC = SETTINGS.get('SHAP_ASYNC', False)
+SHAP_PLOT_DPI = SETTINGS.get('SHAP_PLOT_DPI', 100)
+SHAP_PLOT_FORMAT = SETTINGS.get('SHAP_PLOT_FORMAT', 'png')
+# Opt-in: absent symptom/risk-factor features are taken as 0 (listed in 'defaulted_features')
+DEFAULT_MISSING_SYMPTOMS = SETTINGS.get('DEFAULT_MISSING_SYMPTOMS', False)
+
+
+class LatencyTracker:
+    """Rolling window of request latencies per route, summarized as percentiles"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, seconds):
+        with self._lock:
+            if route not in self._samples:
+                self._samples[route] = deque(maxlen=self.window)
+                self._counts[route] = 0
+            self._samples[route].append(seconds)
+            self._counts[route] += 1
+
+    def summary(self):
+        with self._lock:
+            snapshot = {route: np.array(samples) for route, samples in self._samples.items()}
+            counts = dict(self._counts)
+        summary = {}
+        for route, samples in snapshot.items():
+            p50, p90, p99 = np.percentile(samples * 1000.0, [50, 90, 99])
+            summary[route] = {
+                'count': counts[route],
+                'p50_ms': round(float(p50), 3),
+                'p90_ms': round(float(p90), 3),
+                'p99_ms': round(float(p99), 3),
+                'max_ms': round(float(samples.max() * 1000.0), 3),
+            }
+        return summary
+
+
+# ===============================
+# Startup: load model once per worker
+# ===============================
+app = Flask(__name__)
+app.json.sort_keys = False  # keep feature-info in model feature order
+bundle = load_model_bundle(
+    MODEL_PATH, SCALER_PATH, FEATURE_INFO_PATH,
+    student_model_path=STUDENT_MODEL_PATH if SERVING_MODEL == 'student' else None,
+    compiled_only=COMPILED_ONLY
+)
+if SERVING_MODEL == 'student' and bundle['student_model'] is None:
+    print(f"⚠ {STUDENT_MODEL_PATH} is missing or stale (run distill_model.py) - serving the ensemble")
+feature_names = bundle['feature_names']
+schema = bundle['feature_schema']
+latency = LatencyTracker()
+
+# Concurrent /api/predict requests are stacked into one score_patients() call
+batcher = MicroBatcher(
+    lambda X: score_patients(bundle, X),
+    window_ms=BATCH_WINDOW_MS, max_batch_size=BATCH_MAX_SIZE
+) if MICRO_BATCHING else None
+
+# SHAP explainers for the three ensemble members are built by the first request
+# that needs one: they unpickle the scikit-learn/XGBoost ensemble, which scoring
+# from the compiled model does not need, so startup stays free of it
+_explainer = None
+_explainer_ready = not SHAP_ENABLED
+_explainer_lock = threading.Lock()
+
+# /api/predict/batch chunks are parsed and scored here, off the request thread
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_SCORING_THREADS,
+                                    thread_name_prefix='batch-scoring')
+
+
+def get_explainer():
+    """
+    The explanation engine, built once per worker on first use; None when
+    SHAP_ENABLED is off or shap is not installed (explanations are then left
+    out of responses).
+    """
+    global _explainer, _explainer_ready
+    if not _explainer_ready:
+        with _explainer_lock:
+            if not _explainer_ready:
+                try:
+                    _explainer = ExplanationEngine(bundle['model'], bundle['scaler'],
+                                                   feature_names, key_layout=schema)
+                except ImportError:
+                    print("⚠ shap is not installed - predictions will not include explanations")
+                _explainer_ready = True
+    return _explainer
+
+
+def defaulted_features(checked, row):
+    """Names of the features of a validated row that were absent and taken as 0"""
+    return [feature_names[idx] for idx in np.flatnonzero(checked['defaulted'][row])]
+
+
+def parse_patient(payload):
+    """
+    Turn a JSON object into (raw feature row in feature_names order, names of
+    the features that were defaulted to 0).
+
+    Validation rules are validation.py's: keys are matched to feature names
+    and aliases case-insensitively, unknown keys are rejected, values may be
+    numbers or numeric strings ("75", "1") and every feature is required,
+    unless DEFAULT_MISSING_SYMPTOMS lets absent symptoms default to 0.
+    Raises ValueError with a client-facing message on invalid input.
+    """
+    checked = validate_records([payload], schema, fill_defaults=DEFAULT_MISSING_SYMPTOMS)
+    if not checked['valid'][0]:
+        raise ValueError(error_messages(checked, schema)[0])
+    return checked['X'][0], defaulted_features(checked, 0)
+
+
+def prediction_response(label, proba):
+    """JSON body for one scored patient"""
+    healthy, diseased = float(proba[0]), float(proba[1])
+    return {
+        'success': True,
+        'prediction': int(label),
+        'diagnosis': 'Heart Disease Detected' if label == 1 else 'No Heart Disease Detected',
+        'risk_percentage': round(diseased * 100, 2),
+        'risk_level': str(risk_levels(np.array([diseased]))[0]),
+        'confidence': round(max(healthy, diseased) * 100, 2),
+        'probabilities': {
+            'healthy': round(healthy * 100, 2),
+            'diseased': round(diseased * 100, 2),
+        },
+        'shap_plot': None,
+    }
+
+
+def plot_format():
+    """Chart format for this request: ?plot=png|svg|json, else SHAP_PLOT_FORMAT"""
+    fmt = request.args.get('plot', SHAP_PLOT_FORMAT).lower()
+    if fmt not in CHART_FORMATS:
+        raise ValueError(f"'plot' must be one of {', '.join(CHART_FORMATS)}")
+    return fmt
+
+
+def explanation_response(contributions, base_value, fmt):
+    """
+    JSON body for one explanation: per-feature contributions and the plot,
+    as a PNG/SVG data URI or as bar data for the client to draw (fmt='json')
+    """
+    return {
+        'base_value': round(float(base_value), 4),
+        'contributions': {name: round(float(value), 4)
+                          for name, value in zip(feature_names, contributions)},
+        'shap_plot': render_contributions(feature_names, contributions, fmt, dpi=SHAP_PLOT_DPI),
+    }
+
+
+def iter_ndjson_records(stream):
+    """Yield one record per non-empty NDJSON line (None for lines that are not valid JSON)"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def score_record_chunk(records, first_index):
+    """
+    Validate and score a chunk of batch records: one vectorized validation
+    pass (validation.py) and one vectorized model call.
+
+    Returns the NDJSON text for the chunk, one line per record in input order.
+    Invalid records get a success=false line instead of failing the chunk.
+    """
+    checked = validate_records(records, schema, fill_defaults=DEFAULT_MISSING_SYMPTOMS)
+    results = [None if message is None else
+               {'index': first_index + position, 'success': False, 'error': message}
+               for position, message in enumerate(error_messages(checked, schema))]
+
+    positions = np.flatnonzero(checked['valid'])
+    if len(positions):
+        labels, proba = score_patients(bundle, checked['X'][positions], use_cache=False)
+        for i, position in enumerate(positions.tolist()):
+            body = prediction_response(labels[i], proba[i])
+            del body['shap_plot']
+            body['defaulted_features'] = defaulted_features(checked, position)
+            results[position] = dict(index=first_index + position, **body)
+    return ''.join(json.dumps(result) + '\n' for result in results)
+
+
+def stream_scored_chunks(records):
+    """
+    Score records chunk by chunk and yield NDJSON as each chunk finishes.
+
+    While the executor scores chunk k, this generator is already reading and
+    submitting chunk k+1, so request parsing and model work overlap.
+    """
+    records = iter(records)
+    first_index = 0
+    pending = None
+    while True:
+        chunk = list(islice(records, BATCH_CHUNK_SIZE))
+        if not chunk:
+            break
+        future = batch_executor.submit(score_record_chunk, chunk, first_index)
+        first_index += len(chunk)
+        if pending is not None:
+            yield pending.result()
+        pending = future
+    if pending is not None:
+        yield pending.result()
+
+
+# ===============================
+# Request timing
+# ===============================
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_latency(response):
+    if request.url_rule is not None:
+        rule, start = request.url_rule.rule, g.request_start
+        if response.is_streamed:
+            # after_request runs before a streamed body (/api/predict/batch NDJSON)
+            # is generated; the request ends when the server closes the response
+            response.call_on_close(lambda: latency.record(rule, time.perf_counter() - start))
+        else:
+            latency.record(rule, time.perf_counter() - start)
+    return response
+
+
+# ===============================
+# Routes
+# ===============================
+@app.route('/health', methods=['GET'])
+def health():
+    return jsonify({
+        'status': 'healthy',
+        # the pickled ensemble and scaler are unpickled on first use (model_loader.ModelBundle)
+        'model_loaded': bundle.loaded('model') and bundle['model'] is not None,
+        'scaler_loaded': bundle.loaded('scaler') and bundle['scaler'] is not None,
+        'risk_table_loaded': bundle['risk_table'] is not None,
+        'compiled_model_loaded': bundle['compiled_model'] is not None,
+        'serving_model': 'student' if bundle['student_model'] is not None else 'ensemble',
+    })
+
+
+@app.route('/api/feature-info', methods=['GET'])
+def feature_info():
+    return jsonify({spec['name']: {'label': spec['label'], 'type': spec['kind'],
+                                   'unit': spec['unit'], 'min': spec['min'], 'max': spec['max'],
+                                   'required': not DEFAULT_MISSING_SYMPTOMS or spec['kind'] != 'binary'}
+                    for spec in schema.features})
+
+
+@app.route('/api/predict', methods=['POST'])
+def predict():
+    try:
+        row, defaulted = parse_patient(request.get_json(silent=True))
+        fmt = plot_format()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    if batcher is not None:
+        label, proba = batcher.predict(row)
+    else:
+        labels, probabilities = score_patients(bundle, row[None, :])
+        label, proba = labels[0], probabilities[0]
+    body = prediction_response(label, proba)
+    body['defaulted_features'] = defaulted
+
+    explainer = get_explainer()
+    if explainer is not None and SHAP_ASYNC:
+        key = explainer.explain_async(row)
+        body['explanation_id'] = str(key) if key is not None else None
+    elif explainer is not None:
+        contributions, base_values = explainer.explain(row[None, :])
+        explanation = explanation_response(contributions[0], base_values[0], fmt)
+        body['shap_plot'] = explanation.pop('shap_plot')
+        body['explanation'] = explanation
+    return jsonify(body)
+
+
+@app.route('/api/explain/<int:explanation_id>', methods=['GET'])
+def explain(explanation_id):
+    explainer = get_explainer()
+    if explainer is None:
+        return jsonify({'success': False, 'error': 'Explanations are disabled'}), 404
+    try:
+        fmt = plot_format()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    status, result = explainer.lookup(explanation_id)
+    if status == 'pending':
+        return jsonify({'success': True, 'status': 'pending'}), 202
+    if status == 'missing':
+        return jsonify({'success': False, 'error': 'Unknown explanation id'}), 404
+    return jsonify(dict(success=True, status='ready', **explanation_response(*result, fmt)))
+
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    if request.mimetype in NDJSON_MIMETYPES:
+        records = iter_ndjson_records(request.stream)
+    else:
+        records = request.get_json(silent=True)
+        if not isinstance(records, list):
+            return jsonify({
+                'success': False,
+                'error': 'Request body must be a JSON array or NDJSON (application/x-ndjson)'
+            }), 400
+
+    return Response(
+        stream_with_context(stream_scored_chunks(records)),
+        mimetype='application/x-ndjson'
+    )
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return jsonify({
+        'latency': latency.summary(),
+        'prediction_cache': bundle['prediction_cache'].stats(),
+        'micro_batching': batcher.stats() if batcher is not None else None,
+        'explanations': _explainer.stats() if _explainer is not None else None,
+        'chart_cache': chart_cache.stats(),
+    })
+
+
+if __name__ == '__main__':
+    app.run(
+        host=SETTINGS.get('HOST', '0.0.0.0'),
+        port=SETTINGS.get('PORT', 5000),
+        threaded=True,
+    )
@@ -0,0 +1,120 @@
+"""
+Heart Disease Prediction - Artifact Cache
+Content-addressed store for training intermediates. Every artifact is saved
+under a key derived from the stage name, the keys/digests of its inputs, the
+stage parameters and the library versions, so any combination of inputs that
+was computed before is loaded instead of recomputed, including ones from
+earlier experiments.
+"""
+
+import hashlib
+import json
+import os
+
+import joblib
+
+# ===============================
+# Configuration
+# ===============================
+ARTIFACT_CACHE_DIR = '.artifact_cache'
+ARTIFACT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+
+def library_versions():
+    """Versions that change what a stage computes from the same inputs"""
+    import imblearn
+    import numpy
+    import pandas
+    import sklearn
+    import xgboost
+    return {
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'scikit-learn': sklearn.__version__,
+        'imbalanced-learn': imblearn.__version__,
+        'xgboost': xgboost.__version__,
+    }
+
+
+class ArtifactCache:
+    """
+    Pickled artifacts addressed by sha256(stage, inputs, params, versions).
+
+    inputs are strings that identify the input content: a file digest for raw
+    data, or the key of the upstream artifact. Because a key is fully
+    determined by its inputs, unchanged stages are reused however the
+    downstream parameters change. The cache is pruned least-recently-used
+    first once it exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir=ARTIFACT_CACHE_DIR, max_bytes=ARTIFACT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._versions = library_versions()
+
+    def key(self, stage, inputs, params=None):
+        payload = json.dumps(
+            {'stage': stage, 'inputs': list(inputs), 'params': params, 'versions': self._versions},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f'{key}.pkl')
+
+    def get(self, key):
+        """Return (True, artifact) when the key is cached, else (False, None)"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return False, None
+        value = joblib.load(path)
+        os.utime(path)  # mark as recently used for pruning
+        return True, value
+
+    def put(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+        self.prune()
+
+    def run(self, stage, inputs, params, compute, force=False):
+        """
+        Return (artifact, key) for a stage, computing and storing it on a miss.
+
+        force recomputes and overwrites the cached artifact.
+        """
+        key = self.key(stage, inputs, params)
+        if not force:
+            found, value = self.get(key)
+            if found:
+                print(f"✓ Reused cached '{stage}' ({key[:12]})")
+                return value, key
+        value = compute()
+        self.put(key, value)
+        return value, key
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.pkl'):
+                    stat = os.stat(os.path.join(root, name))
+                    entries.append((stat.st_mtime, stat.st_size, os.path.join(root, name)))
+        return entries
+
+    def prune(self):
+        """Delete least-recently-used artifacts until the cache fits in max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def stats(self):
+        entries = self._entries()
+        return {'entries': len(entries), 'size_bytes': sum(size for _, size, _ in entries),
+                'max_bytes': self.max_bytes}
@@ -0,0 +1,223 @@
+"""
+Heart Disease Prediction - Batch Scoring
+Scores a CSV or Parquet file of patients in fixed-size chunks, so files far
+larger than RAM are streamed through with bounded memory.
+
+Usage:
+    python batch_score.py patients.csv scored.csv [--chunk-size 100000] [--threshold 0.5]
+    python batch_score.py patients.parquet scored.parquet
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from inference import risk_levels, score_patients
+from model_loader import load_model_bundle
+from validation import validate_values
+
+warnings.filterwarnings('ignore')
+
+# ===============================
+# Configuration
+# ===============================
+CHUNK_SIZE = 100000
+RESULT_TYPES = {'prediction': 'int64', 'risk_probability': 'float64', 'risk_level': 'string'}
+
+
+def is_parquet(path):
+    return os.path.splitext(path)[1].lower() in ('.parquet', '.pq')
+
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE):
+    """Yield DataFrames of at most chunk_size rows from a CSV or Parquet file"""
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def input_columns(path):
+    """Column names of a CSV or Parquet file, read from its header / schema only"""
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def write_empty_output(input_path, output_path, feature_names):
+    """Header-only output (the input columns plus the result columns) for an input without rows"""
+    columns = input_columns(input_path)
+    check_columns(columns, feature_names)
+    if is_parquet(output_path):
+        import pyarrow.parquet as pq
+        pq.write_table(parquet_schema(columns, feature_names, input_path).empty_table(), output_path)
+    else:
+        columns = [col for col in columns if col not in RESULT_TYPES] + list(RESULT_TYPES)
+        pd.DataFrame(columns=columns).to_csv(output_path, index=False)
+
+
+def parquet_schema(columns, feature_names, input_path):
+    """
+    Arrow schema of the scored output, fixed before the first chunk is written.
+
+    pandas infers types per chunk (an int column with a missing value becomes
+    double, a chunk of invalid rows has an all-null risk_level), so every
+    chunk is converted to this schema instead: float64 features, nullable
+    int64 prediction, float64 risk_probability and string risk_level. Other
+    columns keep their type from a Parquet input and are strings for CSV.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    input_schema = pq.read_schema(input_path) if is_parquet(input_path) else None
+    fields = []
+    for col in columns:
+        if col in RESULT_TYPES:
+            continue  # re-scoring a scored file: the result columns are replaced
+        if col in feature_names:
+            fields.append(pa.field(col, pa.float64()))
+        elif input_schema is not None:
+            fields.append(input_schema.field(col))
+        else:
+            fields.append(pa.field(col, pa.string()))
+    fields += [pa.field(col, pa.type_for_alias(type_)) for col, type_ in RESULT_TYPES.items()]
+    return pa.schema(fields)
+
+
+def to_parquet_table(scored, schema, feature_names):
+    """A scored chunk as an Arrow table of the fixed output schema"""
+    import pyarrow as pa
+    scored = scored.copy()
+    for field in schema:
+        if field.name in feature_names:
+            # values that failed validation (e.g. 'x') are written as null
+            scored[field.name] = pd.to_numeric(scored[field.name], errors='coerce')
+        elif pa.types.is_string(field.type) and field.name not in RESULT_TYPES:
+            scored[field.name] = scored[field.name].astype('string')
+    return pa.Table.from_pandas(scored, schema=schema, preserve_index=False)
+
+
+def check_columns(columns, feature_names):
+    """Raise ValueError listing every model feature missing from the input"""
+    missing = [feature for feature in feature_names if feature not in columns]
+    if missing:
+        raise ValueError(f"Input is missing required feature columns: {', '.join(missing)}")
+
+
+def score_chunk(bundle, chunk, threshold=None):
+    """
+    Append prediction, risk_probability and risk_level columns to a chunk.
+
+    Rows with a missing, non-numeric or out-of-range feature value (checked for
+    the whole chunk at once by validation.py) are left unscored (empty result
+    columns) instead of failing the whole chunk.
+    """
+    schema = bundle['feature_schema']
+    checked = validate_values(chunk[bundle['feature_names']], schema)
+    X, valid = checked['X'], checked['valid']
+
+    prediction = np.full(len(chunk), np.nan)
+    positive = np.full(len(chunk), np.nan)
+    level = np.full(len(chunk), None, dtype=object)
+    if valid.any():
+        labels, proba = score_patients(bundle, X[valid], threshold=threshold, use_cache=False)
+        prediction[valid] = labels
+        positive[valid] = proba[:, 1]
+        level[valid] = risk_levels(proba[:, 1])
+
+    scored = chunk.copy()
+    scored['prediction'] = pd.array(prediction, dtype='Int64')
+    scored['risk_probability'] = positive
+    scored['risk_level'] = level
+    return scored, int((~valid).sum())
+
+
+def score_file(input_path, output_path, bundle=None, chunk_size=CHUNK_SIZE,
+               threshold=None, progress=None):
+    """
+    Stream input_path through the model into output_path.
+
+    An input with a header but no rows still gets an output file, holding
+    only the header (CSV) or the schema (Parquet).
+    progress, if given, is called after each chunk with (rows_done, elapsed_seconds).
+    Returns a summary dict with row counts and throughput.
+    """
+    bundle = bundle or load_model_bundle()
+    rows = invalid = 0
+    written = False
+    parquet_writer = output_schema = None
+    start = time.perf_counter()
+    try:
+        for chunk in iter_chunks(input_path, chunk_size):
+            first_chunk = rows == 0
+            if first_chunk:
+                check_columns(chunk.columns, bundle['feature_names'])
+            if chunk.empty:
+                continue
+            scored, n_invalid = score_chunk(bundle, chunk, threshold)
+
+            if is_parquet(output_path):
+                import pyarrow.parquet as pq
+                if parquet_writer is None:
+                    output_schema = parquet_schema(chunk.columns, bundle['feature_names'], input_path)
+                    parquet_writer = pq.ParquetWriter(output_path, output_schema)
+                parquet_writer.write_table(
+                    to_parquet_table(scored, output_schema, bundle['feature_names']))
+            else:
+                scored.to_csv(output_path, mode='w' if first_chunk else 'a',
+                              header=first_chunk, index=False)
+
+            written = True
+            rows += len(chunk)
+            invalid += n_invalid
+            if progress is not None:
+                progress(rows, time.perf_counter() - start)
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+    if not written:
+        write_empty_output(input_path, output_path, bundle['feature_names'])
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'invalid_rows': invalid,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Score a CSV/Parquet file of patients')
+    parser.add_argument('input_path')
+    parser.add_argument('output_path')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--threshold', type=float, default=None,
+                        help='P(heart disease) cut-off for prediction=1 (default: argmax)')
+    args = parser.parse_args()
+
+    def report(rows_done, elapsed):
+        print(f"  {rows_done:,} rows scored ({rows_done / elapsed:,.0f} rows/sec)")
+
+    print("=" * 80)
+    print("HEART DISEASE PREDICTION - BATCH SCORING")
+    print("=" * 80)
+    try:
+        summary = score_file(args.input_path, args.output_path, chunk_size=args.chunk_size,
+                             threshold=args.threshold, progress=report)
+    except (FileNotFoundError, ValueError, ImportError) as e:
+        print(f"✗ Error: {e}")
+        sys.exit(1)
+
+    print(f"✓ Scored {summary['rows']:,} rows in {summary['seconds']:.1f}s "
+          f"({summary['rows_per_second']:,.0f} rows/sec)")
+    if summary['invalid_rows']:
+        print(f"✗ {summary['invalid_rows']:,} rows had missing, non-numeric or out-of-range values and were not scored")
+    print(f"✓ Results saved to {args.output_path}")
@@ -0,0 +1,161 @@
+"""
+Heart Disease Prediction - Chart Rendering
+Server-side bar charts (explanation plots) rendered with matplotlib's
+non-interactive Agg backend on one reused figure per thread. Rendered images
+are cached by content hash, so a chart that was drawn once is served from
+memory afterwards.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import numpy as np
+
+# ===============================
+# Configuration
+# ===============================
+CHART_CACHE_MAX_BYTES = 32 * 1024 * 1024
+CHART_FORMATS = ('png', 'svg', 'json')
+CHART_SIZE = (7, 4)
+CHART_DPI = 100
+TOP_FEATURES = 10
+POSITIVE_COLOR = '#ef4444'
+NEGATIVE_COLOR = '#3b82f6'
+MIME_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+
+class ChartCache:
+    """LRU cache of rendered images, bounded by their total size in bytes"""
+
+    def __init__(self, max_bytes=CHART_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return blob
+
+    def put(self, key, blob):
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = blob
+            self.size_bytes += len(blob)
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'size_bytes': self.size_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+
+chart_cache = ChartCache()
+_figures = threading.local()
+
+
+def contribution_bars(feature_names, contributions, top=TOP_FEATURES):
+    """
+    Bar data for the largest contributions, largest first.
+
+    Values are in percentage points, rounded to two decimals; this is what the
+    charts draw and what clients receive when they ask for JSON instead of an image.
+    """
+    contributions = np.asarray(contributions, dtype=np.float64)
+    order = np.argsort(-np.abs(contributions), kind='stable')[:top]
+    return {
+        'labels': [feature_names[i].replace('_', ' ') for i in order],
+        'values': [round(float(contributions[i]) * 100, 2) for i in order],
+        'unit': 'percentage points',
+    }
+
+
+def chart_key(bars, fmt, dpi):
+    """Content hash of a chart: identical bar data renders to identical bytes"""
+    payload = json.dumps({'bars': bars, 'format': fmt, 'dpi': dpi}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _thread_figure():
+    """This thread's reusable figure, cleared for the next chart"""
+    figure = getattr(_figures, 'figure', None)
+    if figure is None:
+        figure = Figure(figsize=CHART_SIZE)
+        FigureCanvasAgg(figure)
+        _figures.figure = figure
+    figure.clear()
+    return figure
+
+
+def _draw_bars(bars, fmt, dpi):
+    figure = _thread_figure()
+    ax = figure.add_subplot()
+    labels, values = bars['labels'][::-1], bars['values'][::-1]
+    colors = [POSITIVE_COLOR if value > 0 else NEGATIVE_COLOR for value in values]
+    ax.barh(labels, values, color=colors)
+    ax.axvline(0, color='#94a3b8', linewidth=0.8)
+    ax.set_xlabel(f"Contribution to heart disease risk ({bars['unit']})")
+    figure.tight_layout()
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=fmt, dpi=dpi)
+    return buffer.getvalue()
+
+
+def render_bars(bars, fmt='png', dpi=CHART_DPI):
+    """Rendered chart bytes for bar data, served from the cache when possible"""
+    if fmt not in MIME_TYPES:
+        raise ValueError(f"Unsupported chart format '{fmt}'")
+    key = chart_key(bars, fmt, dpi)
+    blob = chart_cache.get(key)
+    if blob is None:
+        blob = _draw_bars(bars, fmt, dpi)
+        chart_cache.put(key, blob)
+    return blob
+
+
+def render_contributions(feature_names, contributions, fmt='png', dpi=CHART_DPI):
+    """
+    Explanation chart for one patient.
+
+    fmt 'png' or 'svg' returns a base64 data URI; 'json' returns the bar data
+    itself so the client can draw the chart.
+    """
+    bars = contribution_bars(feature_names, contributions)
+    if fmt == 'json':
+        return bars
+    blob = render_bars(bars, fmt, dpi)
+    return f"data:{MIME_TYPES[fmt]};base64," + base64.b64encode(blob).decode()
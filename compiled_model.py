@@ -0,0 +1,259 @@
+"""
+Heart Disease Prediction - Compiled Ensemble
+Flat, array-backed export of the soft-voting ensemble and a pure-NumPy
+evaluator for it. Serving from the compiled arrays needs neither
+scikit-learn nor xgboost at import or call time.
+
+The export is taken from the scaler-folded model (fold_scaler.py), so the
+evaluator takes raw feature rows. Run after train_model.py (train_model.py
+also exports it automatically):
+    python compiled_model.py
+"""
+
+import json
+import os
+
+import numpy as np
+
+# ===============================
+# Configuration
+# ===============================
+COMPILED_MODEL_PATH = 'heart_model_compiled.npz'
+STUDENT_MODEL_PATH = 'heart_model_student.npz'  # distilled student (distill_model.py)
+EVAL_BATCH_SIZE = 2048
+
+
+def _node_depths(left, right):
+    """Depth of every node (children always have a larger index than their parent)"""
+    depth = np.zeros(len(left), dtype=np.int32)
+    for node in range(len(left)):
+        if left[node] != node:
+            depth[left[node]] = depth[node] + 1
+            depth[right[node]] = depth[node] + 1
+    return depth
+
+
+def _stack_trees(trees):
+    """
+    Concatenate per-tree node arrays into one flat forest.
+
+    trees is a list of (feature, threshold, left, right, leaf_value) with -1
+    marking missing children. Leaves are turned into self-loops so that a fixed
+    number of traversal steps (the forest depth) lands every row on its leaf.
+    Children are interleaved: node n continues at children[2*n + go_right].
+    """
+    roots, features, thresholds, lefts, rights, values = [], [], [], [], [], []
+    max_depth = 0
+    offset = 0
+    for feature, threshold, left, right, value in trees:
+        n_nodes = len(feature)
+        node_ids = np.arange(n_nodes)
+        is_leaf = left < 0
+        left = np.where(is_leaf, node_ids, left)
+        right = np.where(is_leaf, node_ids, right)
+        max_depth = max(max_depth, int(_node_depths(left, right).max()))
+
+        roots.append(offset)
+        features.append(np.where(is_leaf, 0, feature))
+        thresholds.append(np.where(is_leaf, 0.0, threshold))
+        lefts.append(left + offset)
+        rights.append(right + offset)
+        values.append(np.where(is_leaf, value, 0.0))
+        offset += n_nodes
+
+    children = np.stack([np.concatenate(lefts), np.concatenate(rights)], axis=1)
+    return {
+        'roots': np.asarray(roots, dtype=np.int64),
+        'feature': np.concatenate(features).astype(np.int64),
+        'threshold': np.concatenate(thresholds),
+        'children': children.ravel().astype(np.int64),
+        'value': np.concatenate(values),
+        'depth': max_depth,
+    }
+
+
+def export_random_forest(estimator):
+    """Flat node arrays of a fitted Random Forest, P(disease) at the leaves"""
+    trees = []
+    for tree in estimator.estimators_:
+        t = tree.tree_
+        class_weights = t.value[:, 0, :]
+        positive = class_weights[:, 1] / class_weights.sum(axis=1)
+        trees.append((t.feature, t.threshold, t.children_left, t.children_right, positive))
+    forest = _stack_trees(trees)
+
+    # scikit-learn tests float32(x) <= float64(t). Rounding t down to the nearest
+    # float32 keeps that test exact while comparing in float32 at serving time.
+    threshold = forest['threshold']
+    threshold32 = threshold.astype(np.float32)
+    rounded_up = threshold32.astype(np.float64) > threshold
+    forest['threshold'] = np.where(
+        rounded_up, np.nextafter(threshold32, np.float32(-np.inf)), threshold32
+    )
+    return forest
+
+
+def export_xgboost(estimator):
+    """Flat node arrays of a fitted XGBoost classifier, leaf weights in log-odds"""
+    model_json = json.loads(estimator.get_booster().save_raw(raw_format='json'))
+    learner = model_json['learner']
+    trees = []
+    for tree in learner['gradient_booster']['model']['trees']:
+        condition = np.asarray(tree['split_conditions'], dtype=np.float32)
+        trees.append((
+            np.asarray(tree['split_indices']),
+            condition,
+            np.asarray(tree['left_children']),
+            np.asarray(tree['right_children']),
+            condition,  # leaves store their weight in split_conditions
+        ))
+    forest = _stack_trees(trees)
+    forest['threshold'] = forest['threshold'].astype(np.float32)
+    forest['value'] = forest['value'].astype(np.float32)
+
+    base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+    forest['base_margin'] = np.log(base_score / (1.0 - base_score))
+    return forest
+
+
+def compile_estimators(named_estimators):
+    """
+    Flatten fitted estimators (linear, Random Forest, XGBoost) into named arrays.
+
+    Returns (arrays, members): arrays keyed 'name.key' and the member list
+    [{'name', 'kind'}] in the given order.
+    """
+    arrays = {}
+    members = []
+    for name, estimator in named_estimators.items():
+        if hasattr(estimator, 'coef_'):
+            kind = 'linear'
+            arrays[f'{name}.coef'] = estimator.coef_[0].astype(np.float64)
+            arrays[f'{name}.intercept'] = np.float64(estimator.intercept_[0])
+        elif hasattr(estimator, 'get_booster'):
+            kind = 'xgboost'
+            for key, value in export_xgboost(estimator).items():
+                arrays[f'{name}.{key}'] = value
+        elif hasattr(estimator, 'estimators_'):
+            kind = 'random_forest'
+            for key, value in export_random_forest(estimator).items():
+                arrays[f'{name}.{key}'] = value
+        else:
+            raise TypeError(f"Cannot compile {type(estimator).__name__}")
+        members.append({'name': name, 'kind': kind})
+    return arrays, members
+
+
+def save_compiled_model(arrays, meta, compiled_path=COMPILED_MODEL_PATH):
+    """Write member arrays plus the JSON metadata into one .npz file (atomically)"""
+    arrays = dict(arrays, meta=np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8))
+    tmp_path = compiled_path + '.tmp.npz'
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, compiled_path)
+
+
+def export_compiled_model(raw_model, feature_names, model_digest,
+                          compiled_path=COMPILED_MODEL_PATH):
+    """Flatten a scaler-folded VotingClassifier (LR + RF + XGBoost) into an .npz file"""
+    arrays, members = compile_estimators(dict(raw_model.named_estimators_))
+    n_members = len(members)
+    weights = raw_model.weights if raw_model.weights is not None else [1.0] * n_members
+    meta = {
+        'members': members,
+        'weights': [float(w) for w in weights],
+        'classes': [int(c) for c in raw_model.classes_],
+        'feature_names': list(feature_names),
+        'model_digest': model_digest,
+    }
+    save_compiled_model(arrays, meta, compiled_path)
+    return meta
+
+
+def load_compiled_model(model_digest, compiled_path=COMPILED_MODEL_PATH):
+    """Load the compiled arrays, or None when missing or exported from other artifacts"""
+    if not os.path.exists(compiled_path):
+        return None
+    with np.load(compiled_path) as data:
+        arrays = {key: data[key] for key in data.files}
+    meta = json.loads(arrays.pop('meta').tobytes().decode())
+    if meta.get('model_digest') != model_digest:
+        return None
+
+    compiled = dict(meta)
+    compiled['classes'] = np.asarray(meta['classes'])
+    compiled['members'] = []
+    for member in meta['members']:
+        prefix = member['name'] + '.'
+        params = {key[len(prefix):]: value for key, value in arrays.items() if key.startswith(prefix)}
+        if 'depth' in params:
+            params['depth'] = int(params['depth'])
+        compiled['members'].append(dict(member, **params))
+    return compiled
+
+
+def _traverse(forest, X, strict):
+    """
+    Walk every row through every tree at once.
+
+    nodes has shape (n_rows, n_trees); each step replaces every node by its left
+    or right child. scikit-learn sends x <= t left, XGBoost x < t (strict).
+    X is float32 and row-major; it is indexed flat to keep each step to a few
+    np.take gathers. Returns the leaf values, same shape as nodes.
+    """
+    X_flat = X.ravel()
+    row_offsets = (np.arange(len(X), dtype=np.int64) * X.shape[1])[:, None]
+    nodes = np.broadcast_to(forest['roots'], (len(X), len(forest['roots'])))
+    for _ in range(forest['depth']):
+        x = np.take(X_flat, row_offsets + np.take(forest['feature'], nodes))
+        threshold = np.take(forest['threshold'], nodes)
+        go_right = (x >= threshold) if strict else (x > threshold)
+        nodes = np.take(forest['children'], 2 * nodes + go_right)
+    return np.take(forest['value'], nodes)
+
+
+def _member_positive_proba(member, X32, X64):
+    if member['kind'] == 'linear':
+        margin = X64 @ member['coef'] + member['intercept']
+        return 1.0 / (1.0 + np.exp(-margin))
+    if member['kind'] == 'random_forest':
+        return _traverse(member, X32, strict=False).mean(axis=1)
+    # xgboost: sum of leaf weights in float32, then sigmoid of the margin
+    margin = _traverse(member, X32, strict=True).sum(axis=1, dtype=np.float32)
+    margin = margin.astype(np.float64) + member['base_margin']
+    return 1.0 / (1.0 + np.exp(-margin))
+
+
+def compiled_predict_proba(compiled, X, batch_size=EVAL_BATCH_SIZE):
+    """
+    Soft-vote class probabilities for raw feature rows, shape (n_rows, 2).
+
+    Trees compare against float32 feature values, as scikit-learn and XGBoost do.
+    Rows are evaluated in batches to bound the (rows x trees) node matrices.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    weights = np.asarray(compiled['weights'], dtype=np.float64)
+    weights = weights / weights.sum()
+
+    positive = np.empty(len(X))
+    for start in range(0, len(X), batch_size):
+        X64 = X[start:start + batch_size]
+        X32 = X64.astype(np.float32)
+        batch = np.zeros(len(X64))
+        for weight, member in zip(weights, compiled['members']):
+            batch += weight * _member_positive_proba(member, X32, X64)
+        positive[start:start + batch_size] = batch
+    return np.column_stack([1.0 - positive, positive])
+
+
+if __name__ == '__main__':
+    import joblib
+    from fold_scaler import MODEL_PATH, SCALER_PATH, fold_scaler_into_ensemble, load_raw_model
+    from risk_table import FEATURE_INFO_PATH, artifact_digest
+
+    model_digest = artifact_digest([MODEL_PATH, SCALER_PATH])
+    raw_model = load_raw_model(model_digest)
+    if raw_model is None:
+        raw_model = fold_scaler_into_ensemble(joblib.load(MODEL_PATH), joblib.load(SCALER_PATH))
+    feature_names = joblib.load(FEATURE_INFO_PATH)['feature_names']
+    export_compiled_model(raw_model, feature_names, model_digest)
+    print(f"✓ Compiled model saved to {COMPILED_MODEL_PATH}")
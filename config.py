@@ -8,14 +8,33 @@ SECRET_KEY=your-secret-key-here
 ## Server Settings
 HOST=0.0.0.0
 PORT=5000
+WORKERS=4
+THREADS=8
+LATENCY_WINDOW=10000
 
 ## Model Settings
 MODEL_PATH=heart_model.pkl
 SCALER_PATH=scaler.pkl
+SERVING_MODEL=ensemble
+STUDENT_MODEL_PATH=heart_model_student.npz
+# Score from heart_model_compiled.npz only (no scikit-learn/xgboost at serving time)
+COMPILED_ONLY=False
+
+## Micro-Batching (/api/predict)
+MICRO_BATCHING=True
+BATCH_WINDOW_MS=2
+BATCH_MAX_SIZE=256
+
+## Batch Endpoint (/api/predict/batch)
+BATCH_CHUNK_SIZE=1000
+BATCH_SCORING_THREADS=2
 
 ## SHAP Settings
 SHAP_BACKGROUND_SIZE=100
 SHAP_PLOT_DPI=100
+SHAP_PLOT_FORMAT=png
+SHAP_ENABLED=True
+SHAP_ASYNC=False
 
 ## Feature Validation
 MIN_AGE=18
@@ -30,6 +49,9 @@ MAX_CHOLESTEROL=400
 MIN_HEART_RATE=40
 MAX_HEART_RATE=220
 
+# Take absent symptom/risk-factor features as 0 (reported per response)
+DEFAULT_MISSING_SYMPTOMS=False
+
 ## Medical Parameters
 RISK_THRESHOLDS={"low": 0.3, "moderate": 0.6, "high": 0.8}
 
@@ -0,0 +1,152 @@
+"""
+Heart Disease Prediction - Dataset Loader
+Typed, memory-efficient loading of heart.csv
+
+Columns are parsed straight into compact dtypes taken from feature_info.pkl:
+the 0/1 symptom and risk-factor features, Age and the target are uint8
+(1 byte per value instead of 8). Large files are read in chunks, and the
+typed table is cached next to the CSV as Parquet so later loads skip CSV
+parsing entirely (when pyarrow is installed).
+"""
+
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# ===============================
+# Configuration
+# ===============================
+DATASET_PATH = 'heart.csv'
+FEATURE_INFO_PATH = 'feature_info.pkl'
+CHUNK_SIZE = 500000
+CACHE_SUFFIX = '.parquet'
+CACHE_METADATA_KEY = b'heart_dataset_source'
+
+
+def find_target_column(columns):
+    """The target-like column ('target', 'heart' or 'risk' in the name), else the last one"""
+    for col in columns:
+        if 'target' in col.lower() or 'heart' in col.lower() or 'risk' in col.lower():
+            return col
+    return columns[-1]
+
+
+def dataset_schema(columns, feature_info_path=FEATURE_INFO_PATH):
+    """
+    Column dtypes for the CSV header.
+
+    Features known from feature_info.pkl (and the target) are read as nullable
+    UInt8; any other column is left to pandas and downcast afterwards.
+    """
+    if not os.path.exists(feature_info_path):
+        return {}
+    feature_info = joblib.load(feature_info_path)
+    known = set(feature_info['feature_names']) | {feature_info.get('target_column')}
+    return {col: 'UInt8' for col in columns if col in known}
+
+
+def _downcast(chunk, schema):
+    for col in chunk.columns:
+        if col not in schema and pd.api.types.is_numeric_dtype(chunk[col]):
+            kind = 'float' if pd.api.types.is_float_dtype(chunk[col]) else 'integer'
+            chunk[col] = pd.to_numeric(chunk[col], downcast=kind)
+    return chunk
+
+
+def read_header(path):
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def iter_csv_chunks(path, schema, chunk_size=CHUNK_SIZE):
+    """Typed chunks of chunk_size rows; missing values are left as NA"""
+    for chunk in pd.read_csv(path, dtype=schema, chunksize=chunk_size):
+        yield _downcast(chunk, schema)
+
+
+def read_csv_typed(path, schema, chunk_size=CHUNK_SIZE):
+    """Parse the CSV in chunks of chunk_size rows directly into the compact schema"""
+    chunks = list(iter_csv_chunks(path, schema, chunk_size))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=read_header(path))
+
+
+def fill_missing(df, columns):
+    """
+    Mean-fill missing values in the given columns.
+
+    Complete columns keep their compact dtype; columns that had gaps become
+    float32 (the fill value is a fractional mean). Nullable integer columns
+    without gaps are converted to plain NumPy integers.
+    """
+    for col in columns:
+        series = df[col]
+        if series.isna().any():
+            df[col] = series.astype('float32').fillna(np.float32(series.mean()))
+        elif isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+            df[col] = series.to_numpy(dtype=series.dtype.numpy_dtype)
+    return df
+
+
+def _source_signature(path, schema):
+    """Identifies the CSV version and the schema the cache was parsed with"""
+    stat = os.stat(path)
+    return json.dumps({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'schema': schema},
+                      sort_keys=True).encode()
+
+
+def _read_parquet_cache(cache_path, signature):
+    """The cached table, or None when missing, stale or pyarrow is unavailable"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    if not os.path.exists(cache_path):
+        return None
+    if (pq.read_schema(cache_path).metadata or {}).get(CACHE_METADATA_KEY) != signature:
+        return None
+    return pq.read_table(cache_path).to_pandas()
+
+
+def _write_parquet_cache(df, cache_path, signature):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[CACHE_METADATA_KEY] = signature
+    table = table.replace_schema_metadata(metadata)
+    tmp_path = cache_path + '.tmp'
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, cache_path)
+
+
+def load_dataset(path=DATASET_PATH, feature_info_path=FEATURE_INFO_PATH,
+                 chunk_size=CHUNK_SIZE, use_cache=True):
+    """
+    Load the dataset as a compact DataFrame with missing feature values mean-filled.
+
+    The parsed table is cached as <path>.parquet and reused while the CSV's
+    size and modification time, and the schema, are unchanged.
+    """
+    cache_path = path + CACHE_SUFFIX
+    schema = dataset_schema(read_header(path), feature_info_path)
+    signature = _source_signature(path, schema)
+    df = _read_parquet_cache(cache_path, signature) if use_cache else None
+    if df is None:
+        df = read_csv_typed(path, schema, chunk_size)
+        if use_cache:
+            _write_parquet_cache(df, cache_path, signature)
+
+    target_col = find_target_column(df.columns.tolist())
+    df = fill_missing(df, [col for col in df.columns if col != target_col])
+    if isinstance(df[target_col].dtype, pd.api.extensions.ExtensionDtype):
+        df[target_col] = df[target_col].to_numpy(dtype=df[target_col].dtype.numpy_dtype)
+    return df
+
+
+def memory_usage_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
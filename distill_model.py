@@ -0,0 +1,192 @@
+"""
+Heart Disease Prediction - Model Distillation
+Trains one compact student model to reproduce the soft-voting ensemble (the
+teacher) and exports it as an alternative serving model.
+
+The student is a shallow gradient-boosted model fitted to the teacher's
+probabilities on patients drawn uniformly from the whole input space (every
+combination of the binary features, ages MIN_AGE..MAX_AGE) plus the patients
+of the dataset. It is saved in the compiled-array format (compiled_model.py),
+so it is served by the pure-NumPy evaluator.
+
+Run after train_model.py:
+    python distill_model.py
+and serve it with SERVING_MODEL=student in config.py.
+"""
+
+import argparse
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from xgboost import XGBRegressor
+
+from compiled_model import (
+    STUDENT_MODEL_PATH, compile_estimators, compiled_predict_proba, load_compiled_model,
+    save_compiled_model
+)
+from dataset import find_target_column, load_dataset
+from feature_encoding import split_feature_indices, unpack_features
+from inference import score_patients
+from model_loader import MODEL_PATH, SCALER_PATH, load_model_bundle
+from risk_table import MAX_AGE, MIN_AGE, artifact_digest
+
+warnings.filterwarnings('ignore')
+
+# ===============================
+# Configuration
+# ===============================
+DATASET_PATH = 'heart.csv'
+RANDOM_STATE = 42
+TEST_SIZE = 0.2
+DISTILL_SAMPLES = 400000
+HOLDOUT_SAMPLES = 50000
+LATENCY_REPEATS = 200
+STUDENT_PARAMS = {
+    'n_estimators': 120,
+    'max_depth': 4,
+    'learning_rate': 0.2,
+    'objective': 'binary:logistic',
+    'tree_method': 'hist',
+    'random_state': RANDOM_STATE,
+}
+
+
+def sample_input_space(n_rows, feature_names, rng, min_age=MIN_AGE, max_age=MAX_AGE):
+    """Raw feature rows drawn uniformly over all binary combinations and ages"""
+    n_bits = len(split_feature_indices(feature_names)[0])
+    bits = rng.integers(0, 1 << n_bits, size=n_rows, dtype=np.int64)
+    ages = rng.integers(min_age, max_age + 1, size=n_rows)
+    return unpack_features(bits, ages, feature_names)
+
+
+def load_dataset_split(feature_names, path=DATASET_PATH):
+    """(X_train, X_test, y_test) from the dataset with train_model.py's split, or None"""
+    if not os.path.exists(path):
+        return None
+    df = load_dataset(path)
+    X = df[feature_names].to_numpy(dtype=np.float64)
+    y = df[find_target_column(df.columns.tolist())].to_numpy()
+    X_train, X_test, _, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y
+    )
+    return X_train, X_test, y_test
+
+
+def teacher_proba(bundle, X):
+    """The ensemble's P(heart disease) for raw rows"""
+    return score_patients(bundle, X, use_cache=False)[1][:, 1]
+
+
+def train_student(X, soft_labels, params=STUDENT_PARAMS):
+    """Fit the student to the teacher's probabilities (logistic loss on soft labels)"""
+    student = XGBRegressor(**params)
+    student.fit(X, soft_labels)
+    return student
+
+
+def export_student(student, feature_names, model_digest, student_path=STUDENT_MODEL_PATH):
+    """
+    Save the student in the compiled-array format.
+
+    model_digest is the teacher's, so the student is only served next to the
+    ensemble it was distilled from.
+    """
+    arrays, members = compile_estimators({'student': student})
+    meta = {
+        'members': members,
+        'weights': [1.0],
+        'classes': [0, 1],
+        'feature_names': list(feature_names),
+        'model_digest': model_digest,
+    }
+    save_compiled_model(arrays, meta, student_path)
+    return meta
+
+
+def load_student_model(model_digest, student_path=STUDENT_MODEL_PATH):
+    """Load the compiled student, or None when missing or distilled from other artifacts"""
+    return load_compiled_model(model_digest, student_path)
+
+
+def single_row_latency(predict, X, repeats=LATENCY_REPEATS):
+    """Median milliseconds to score one patient"""
+    timings = []
+    for i in range(repeats):
+        row = X[i % len(X)][None, :]
+        start = time.perf_counter()
+        predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000.0)
+
+
+def compare(teacher, student, labels=None):
+    """Agreement and error of the student against the teacher (and AUCs against labels)"""
+    report = {
+        'rows': len(teacher),
+        'agreement': float(np.mean((teacher >= 0.5) == (student >= 0.5))),
+        'mean_abs_error': float(np.mean(np.abs(teacher - student))),
+        'max_abs_error': float(np.max(np.abs(teacher - student))),
+    }
+    if labels is not None:
+        report['teacher_auc'] = float(roc_auc_score(labels, teacher))
+        report['student_auc'] = float(roc_auc_score(labels, student))
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Distill the ensemble into a compact student model')
+    parser.add_argument('--samples', type=int, default=DISTILL_SAMPLES)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("HEART DISEASE PREDICTION - MODEL DISTILLATION")
+    print("=" * 80)
+
+    bundle = load_model_bundle()
+    feature_names = bundle['feature_names']
+    model_digest = artifact_digest([MODEL_PATH, SCALER_PATH])
+    rng = np.random.default_rng(RANDOM_STATE)
+
+    dataset = load_dataset_split(feature_names)
+    X_distill = sample_input_space(args.samples, bundle['feature_schema'], rng)
+    if dataset is not None:
+        X_distill = np.vstack([X_distill, dataset[0]])
+    X_holdout = sample_input_space(HOLDOUT_SAMPLES, bundle['feature_schema'], rng)
+
+    start = time.perf_counter()
+    soft_labels = teacher_proba(bundle, X_distill)
+    print(f"✓ Teacher scored {len(X_distill):,} patients in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    student = train_student(X_distill, soft_labels)
+    print(f"✓ Student trained in {time.perf_counter() - start:.1f}s "
+          f"({STUDENT_PARAMS['n_estimators']} trees, depth {STUDENT_PARAMS['max_depth']})")
+
+    export_student(student, feature_names, model_digest)
+    compiled_student = load_student_model(model_digest)
+    print(f"✓ Student saved to {STUDENT_MODEL_PATH}")
+
+    def student_proba(X):
+        return compiled_predict_proba(compiled_student, X)[:, 1]
+
+    reports = {'input space (holdout)': compare(teacher_proba(bundle, X_holdout),
+                                                student_proba(X_holdout))}
+    if dataset is not None:
+        X_test, y_test = dataset[1], dataset[2]
+        reports['dataset test split'] = compare(teacher_proba(bundle, X_test),
+                                                student_proba(X_test), y_test)
+
+    print("\nStudent vs teacher:")
+    print(pd.DataFrame(reports).T.drop(columns='rows').round(4).to_string())
+
+    if bundle['compiled_model'] is not None:
+        teacher_ms = single_row_latency(
+            lambda X: compiled_predict_proba(bundle['compiled_model'], X), X_holdout)
+        student_ms = single_row_latency(student_proba, X_holdout)
+        print(f"\nSingle-patient latency (compiled): teacher {teacher_ms:.3f} ms, "
+              f"student {student_ms:.3f} ms ({student_ms / teacher_ms:.0%} of the teacher)")
@@ -0,0 +1,229 @@
+"""
+Heart Disease Prediction - Explanation Engine
+Per-patient SHAP contributions to P(heart disease) for all three ensemble
+members, computed in batches, memoized by canonical patient key and optionally
+in the background so predictions are not held up by explanation work.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from feature_encoding import patient_keys
+from micro_batcher import MicroBatcher
+
+# ===============================
+# Configuration
+# ===============================
+EXPLANATION_CACHE_SIZE = 20000
+EXPLANATION_WINDOW_MS = 5.0
+EXPLANATION_MAX_BATCH = 64
+EXPLAIN_BATCH_SIZE = 2048
+
+
+def _sigmoid(margin):
+    return 1.0 / (1.0 + np.exp(-margin))
+
+
+def margin_to_probability(contributions, base_margin, margin):
+    """
+    Rescale log-odds contributions so they add up in probability space.
+
+    Each row is multiplied by (p - p_base) / (margin - margin_base), which keeps
+    the relative size and sign of every feature's contribution and makes them
+    sum to the change in predicted probability.
+    """
+    delta_margin = margin - base_margin
+    delta_proba = _sigmoid(margin) - _sigmoid(base_margin)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(np.abs(delta_margin) > 1e-12, delta_proba / delta_margin,
+                         _sigmoid(margin) * (1.0 - _sigmoid(margin)))
+    return contributions * ratio[:, None]
+
+
+def linear_contributions(coef, intercept, X_scaled):
+    """
+    Closed-form attributions of a logistic regression on standardized inputs.
+
+    Standardized features have mean 0 over the training data, so with
+    independent features the Shapley value of feature j is coef_j * z_j in
+    log-odds, with the intercept as the base margin. Returns (contributions,
+    base_values) in probability space.
+    """
+    raw = X_scaled * coef
+    base_margin = np.full(len(X_scaled), float(intercept))
+    contributions = margin_to_probability(raw, base_margin, raw.sum(axis=1) + base_margin)
+    return contributions, _sigmoid(base_margin)
+
+
+def tree_shap_contributions(explainer, X_scaled):
+    """
+    Path-dependent TreeSHAP values of a Random Forest for P(disease).
+
+    explainer is a shap.TreeExplainer over the forest. Returns (contributions,
+    base_values): the Shapley values of the positive class and the forest's
+    expected output, which add up to its predicted probability.
+    """
+    values = np.asarray(explainer.shap_values(X_scaled, check_additivity=False))
+    contributions = values[:, :, 1] if values.ndim == 3 else values[1]
+    return contributions, np.full(len(X_scaled), np.ravel(explainer.expected_value)[-1])
+
+
+def booster_shap_contributions(booster, X_scaled):
+    """
+    XGBoost's built-in path-dependent TreeSHAP (pred_contribs), in log-odds,
+    rescaled to probability space. Returns (contributions, base_values).
+    """
+    from xgboost import DMatrix
+    raw = booster.predict(DMatrix(X_scaled), pred_contribs=True)
+    base_margin = raw[:, -1]
+    contributions = margin_to_probability(raw[:, :-1], base_margin, raw.sum(axis=1))
+    return contributions, _sigmoid(base_margin)
+
+
+class ExplanationEngine:
+    """
+    SHAP explanations of P(heart disease) for the soft-voting ensemble.
+
+    Each member gets a dedicated explainer, prepared once when the engine is created:
+      - Logistic Regression: closed-form linear SHAP values (independent features,
+        training mean as the background)
+      - Random Forest: shap.TreeExplainer (path-dependent TreeSHAP)
+      - XGBoost: the booster's built-in path-dependent TreeSHAP (pred_contribs)
+    Log-odds contributions are rescaled to probability space and the members
+    are combined with the soft-vote weights, so for every row
+    base_value + contributions.sum() equals the ensemble's probability.
+    explain() returns (contributions, base_values), one column per feature.
+    shap is only needed for the Random Forest member; without it the engine
+    raises ImportError.
+    """
+
+    def __init__(self, model, scaler, feature_names, cache_size=EXPLANATION_CACHE_SIZE,
+                 key_layout=None):
+        self.feature_names = list(feature_names)
+        # memo keys: feature_encoding.patient_keys() over the schema layout when given
+        self.key_layout = key_layout if key_layout is not None else self.feature_names
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+
+        weights = model.weights if model.weights is not None else [1.0] * len(model.estimators_)
+        weights = np.asarray(weights, dtype=np.float64) / np.sum(weights)
+        self.members = []
+        for (name, estimator), weight in zip(model.named_estimators_.items(), weights):
+            if hasattr(estimator, 'coef_'):
+                params = {'coef': estimator.coef_[0].astype(np.float64),
+                          'intercept': float(estimator.intercept_[0])}
+                self.members.append((name, 'linear', params, weight))
+            elif hasattr(estimator, 'get_booster'):
+                self.members.append((name, 'xgboost', estimator.get_booster(), weight))
+            elif hasattr(estimator, 'estimators_'):
+                import shap
+                self.members.append((name, 'random_forest', shap.TreeExplainer(estimator), weight))
+            else:
+                raise TypeError(f"Cannot explain {type(estimator).__name__}")
+
+        self.cache_size = cache_size
+        self._memo = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._batcher = MicroBatcher(
+            self.explain, window_ms=EXPLANATION_WINDOW_MS, max_batch_size=EXPLANATION_MAX_BATCH
+        )
+
+    def _member_contributions(self, kind, explainer, X_scaled):
+        if kind == 'linear':
+            return linear_contributions(explainer['coef'], explainer['intercept'], X_scaled)
+        if kind == 'random_forest':
+            return tree_shap_contributions(explainer, X_scaled)
+        return booster_shap_contributions(explainer, X_scaled)
+
+    def contributions(self, X, batch_size=EXPLAIN_BATCH_SIZE):
+        """Contributions for raw feature rows, without memoization"""
+        X_scaled = (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+        contributions = np.zeros(X_scaled.shape)
+        base_values = np.zeros(len(X_scaled))
+        for start in range(0, len(X_scaled), batch_size):
+            batch = slice(start, start + batch_size)
+            for _, kind, explainer, weight in self.members:
+                member, member_base = self._member_contributions(kind, explainer,
+                                                                 X_scaled[batch])
+                contributions[batch] += weight * member
+                base_values[batch] += weight * member_base
+        return contributions, base_values
+
+    def explain(self, X):
+        """
+        Explain raw feature rows (feature_names order), one batch for all cache misses.
+
+        Returns (contributions, base_values).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        keys, valid = patient_keys(X, self.key_layout)
+        contributions = np.zeros(X.shape)
+        base_values = np.zeros(len(X))
+
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys.tolist()):
+                entry = self._memo.get(key) if valid[i] else None
+                if entry is None:
+                    missing.append(i)
+                    continue
+                self._memo.move_to_end(key)
+                contributions[i], base_values[i] = entry
+
+        if missing:
+            computed, computed_base = self.contributions(X[missing])
+            contributions[missing] = computed
+            base_values[missing] = computed_base
+            with self._lock:
+                for j, i in enumerate(missing):
+                    if valid[i]:
+                        self._memo[int(keys[i])] = (computed[j], computed_base[j])
+                while len(self._memo) > self.cache_size:
+                    self._memo.popitem(last=False)
+        return contributions, base_values
+
+    def explain_async(self, row):
+        """
+        Start explaining one raw row in the background and return its patient key.
+
+        Concurrent requests are micro-batched into one explain() call; the result
+        lands in the memo, where lookup(key) finds it. Returns None for rows
+        without a canonical key (those can only be explained synchronously).
+        """
+        keys, valid = patient_keys(np.asarray(row, dtype=np.float64)[None, :], self.key_layout)
+        if not valid[0]:
+            return None
+        key = int(keys[0])
+        with self._lock:
+            if key in self._memo or key in self._pending:
+                return key
+            future = self._batcher.submit(row)
+            self._pending[key] = future
+        future.add_done_callback(lambda _: self._store_async(key, future))
+        return key
+
+    def _store_async(self, key, future):
+        with self._lock:
+            self._pending.pop(key, None)
+            if future.exception() is None:
+                self._memo[key] = future.result()
+                while len(self._memo) > self.cache_size:
+                    self._memo.popitem(last=False)
+
+    def lookup(self, key):
+        """Return ('ready', (contributions, base_value)), ('pending', None) or ('missing', None)"""
+        with self._lock:
+            if key in self._memo:
+                return 'ready', self._memo[key]
+            if key in self._pending:
+                return 'pending', None
+        return 'missing', None
+
+    def stats(self):
+        with self._lock:
+            return {'memoized': len(self._memo), 'pending': len(self._pending),
+                    'max_entries': self.cache_size}
+
@@ -0,0 +1,88 @@
+"""
+Heart Disease Prediction - Feature Encoding
+Bit-packed representation of the binary patient features
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from feature_schema import AGE_FEATURE
+
+
+@lru_cache(maxsize=8)
+def _name_layout(feature_names):
+    age_idx = feature_names.index(AGE_FEATURE)
+    binary_idx = np.array([i for i in range(len(feature_names)) if i != age_idx])
+    return binary_idx, age_idx
+
+
+def split_feature_indices(feature_names):
+    """
+    Return (indices of the 0/1 features in bit order, index of the age feature).
+
+    A FeatureSchema (feature_schema.py) carries its compiled bit layout; for a
+    plain list of names every feature except Age is a bit, in list order.
+    """
+    layout = getattr(feature_names, 'bit_layout', None)
+    if layout is not None:
+        return layout
+    return _name_layout(tuple(feature_names))
+
+
+def raw_feature_indices(feature_names):
+    """
+    Indices of the features a bitmask cannot hold (schema encoding 'raw', e.g.
+    Blood_Pressure); none for a plain list of names.
+    """
+    return getattr(feature_names, 'raw_indices', ())
+
+
+def pack_features(X, feature_names):
+    """
+    Pack raw feature rows into integer bitmasks.
+
+    Bit i of the mask holds the i-th binary feature (in feature_names order,
+    Age excluded). Returns (bits, ages, valid) where valid is False for rows
+    whose binary features are not exactly 0/1 or whose age is not a whole number;
+    those rows have no canonical encoding and must be scored by the model.
+    The mask cannot hold continuous (raw) features, so when the layout has any,
+    every row is invalid: rows differing only in a raw value would share a key.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    binary_idx, age_idx = split_feature_indices(feature_names)
+    binary = X[:, binary_idx]
+    ages = X[:, age_idx]
+
+    valid = np.all((binary == 0) | (binary == 1), axis=1) & (ages == np.round(ages))
+    if len(raw_feature_indices(feature_names)):
+        valid[:] = False
+    weights = np.left_shift(np.int64(1), np.arange(len(binary_idx), dtype=np.int64))
+    bits = (binary > 0.5).astype(np.int64) @ weights
+    return bits, np.round(ages).astype(np.int64), valid
+
+
+def unpack_features(bits, ages, feature_names):
+    """Rebuild raw feature rows (float64, feature_names order) from bitmasks and ages"""
+    if len(raw_feature_indices(feature_names)):
+        raise ValueError("The feature layout has continuous features; "
+                         "its input space cannot be enumerated from bitmasks")
+    bits = np.asarray(bits, dtype=np.int64)
+    binary_idx, age_idx = split_feature_indices(feature_names)
+    X = np.empty((len(bits), len(feature_names)), dtype=np.float64)
+    X[:, binary_idx] = (bits[:, None] >> np.arange(len(binary_idx), dtype=np.int64)) & 1
+    X[:, age_idx] = ages
+    return X
+
+
+def patient_keys(X, feature_names):
+    """
+    Canonical integer key per row: (age << n_bits) | bitmask.
+
+    Identical patient vectors always map to the same key, so the key can be used
+    to memoize predictions. Returns (keys, valid) with the same meaning of valid
+    as pack_features().
+    """
+    bits, ages, valid = pack_features(X, feature_names)
+    n_bits = len(split_feature_indices(feature_names)[0])
+    return (ages << n_bits) | bits, valid
@@ -0,0 +1,239 @@
+"""
+Heart Disease Prediction - Feature Schema
+Compiled per-feature metadata: dtype, value range, input widget, encoding and
+bit position of every model feature, in model feature order.
+
+The schema is built once at training time (train_model.py) from the training
+data and the ranges declared in config.py, and saved as feature_schema.json
+next to feature_info.pkl. The UI, request validation, batch scoring and the
+bit-packed key cache read it instead of guessing from feature names.
+"""
+
+import json
+import os
+from collections.abc import Sequence
+from functools import cached_property
+
+# ===============================
+# Configuration
+# ===============================
+FEATURE_SCHEMA_PATH = 'feature_schema.json'
+SCHEMA_VERSION = 1
+AGE_FEATURE = 'Age'  # packed above the binary bits by feature_encoding
+
+# config.py range settings per feature: MIN_<name> / MAX_<name>
+RANGE_SETTINGS = {
+    'Age': 'AGE',
+    'Blood_Pressure': 'BP',
+    'Cholesterol': 'CHOLESTEROL',
+    'Heart_Rate': 'HEART_RATE',
+}
+FEATURE_DETAILS = {
+    'Age': {'unit': 'years', 'help': 'Age in years', 'default': 55},
+    'Blood_Pressure': {'unit': 'mmHg', 'help': 'Resting blood pressure in mmHg'},
+    'Cholesterol': {'unit': 'mg/dL', 'help': 'Serum cholesterol in mg/dL'},
+    'Heart_Rate': {'unit': 'bpm', 'help': 'Maximum heart rate achieved'},
+}
+OPTION_LABELS = {'Gender': ['Female', 'Male']}
+DEFAULT_OPTION_LABELS = ['No', 'Yes']
+# Request keys accepted for a feature besides its (case-insensitive) name
+FEATURE_ALIASES = {'Gender': ['sex']}
+
+
+def column_stats(X, stats=None):
+    """
+    Per-column min, max and whether every value is 0/1 or whole, ignoring NaN.
+
+    Passing the stats of earlier chunks merges them, so the schema can be built
+    from a stream of chunks as well as from the whole training frame.
+    """
+    import numpy as np
+
+    X = np.asarray(X, dtype=np.float64)
+    observed = ~np.isnan(X)
+    chunk = {
+        'min': np.where(observed, X, np.inf).min(axis=0),
+        'max': np.where(observed, X, -np.inf).max(axis=0),
+        'binary': np.all(~observed | (X == 0) | (X == 1), axis=0),
+        'integer': np.all(~observed | (X == np.round(X)), axis=0),
+    }
+    if stats is not None:
+        chunk = {
+            'min': np.minimum(chunk['min'], stats['min']),
+            'max': np.maximum(chunk['max'], stats['max']),
+            'binary': chunk['binary'] & stats['binary'],
+            'integer': chunk['integer'] & stats['integer'],
+        }
+    return chunk
+
+
+def _integer_dtype(low, high):
+    if low >= 0 and high <= 255:
+        return 'uint8'
+    return 'int16' if -32768 <= low and high <= 32767 else 'int32'
+
+
+def _feature_spec(name, kind, low, high):
+    details = FEATURE_DETAILS.get(name, {})
+    spec = {
+        'name': name,
+        'label': name.replace('_', ' ').title(),
+        'kind': kind,
+        'unit': details.get('unit'),
+        'help': details.get('help'),
+        'aliases': FEATURE_ALIASES.get(name, []),
+    }
+    if kind == 'binary':
+        spec.update(dtype='uint8', min=0, max=1, default=0, widget='selectbox',
+                    options=[0, 1], option_labels=OPTION_LABELS.get(name, DEFAULT_OPTION_LABELS))
+    elif kind == 'integer':
+        low, high = int(low), int(high)
+        spec.update(dtype=_integer_dtype(low, high), min=low, max=high,
+                    default=int(details.get('default', (low + high) // 2)),
+                    widget='slider', step=1)
+    else:
+        spec.update(dtype='float32', min=float(low), max=float(high),
+                    default=float(details.get('default', round((low + high) / 2, 1))),
+                    widget='slider', step=0.1)
+    return spec
+
+
+def build_feature_schema(feature_names, target_column, stats, settings=None):
+    """
+    Compile the schema from training-data column stats (column_stats()).
+
+    0/1 columns become binary features with consecutive bit positions (the
+    feature_encoding bitmask order). Other columns take their range from the
+    config.py MIN_/MAX_ setting when one is declared (RANGE_SETTINGS), else
+    from the observed training range.
+    """
+    if settings is None:
+        from settings import SETTINGS as settings
+    features = []
+    bit = 0
+    for idx, name in enumerate(feature_names):
+        if name != AGE_FEATURE and bool(stats['binary'][idx]):
+            spec = _feature_spec(name, 'binary', 0, 1)
+            spec.update(encoding='bit', bit=bit)
+            bit += 1
+        else:
+            setting = RANGE_SETTINGS.get(name)
+            low = settings.get(f'MIN_{setting}', stats['min'][idx]) if setting else stats['min'][idx]
+            high = settings.get(f'MAX_{setting}', stats['max'][idx]) if setting else stats['max'][idx]
+            kind = 'integer' if bool(stats['integer'][idx]) else 'continuous'
+            spec = _feature_spec(name, kind, low, high)
+            spec.update(encoding='age' if name == AGE_FEATURE else 'raw', bit=None)
+        features.append(spec)
+    return FeatureSchema(features, target_column)
+
+
+class FeatureSchema(Sequence):
+    """
+    The compiled schema; behaves as the sequence of feature names.
+
+    Lookups that requests need (case-insensitive names and aliases, the
+    bitmask layout, the value bounds) are computed once per schema.
+    """
+
+    def __init__(self, features, target_column=None):
+        self.features = list(features)
+        self.target_column = target_column
+        self.names = [spec['name'] for spec in self.features]
+        self.key_index = {}
+        for idx, spec in enumerate(self.features):
+            self.key_index[spec['name'].lower()] = idx
+            for alias in spec.get('aliases', []):
+                self.key_index.setdefault(alias.lower(), idx)
+
+    def __getitem__(self, idx):
+        return self.names[idx]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def spec(self, name):
+        return self.features[self.names.index(name)]
+
+    def lookup(self, key):
+        """Feature index for a request key (name or alias, any case), or None"""
+        return self.key_index.get(str(key).lower())
+
+    @cached_property
+    def bit_layout(self):
+        """(column indices of the bit-encoded features in bit order, index of the age feature)"""
+        import numpy as np
+        bits = sorted((spec['bit'], idx) for idx, spec in enumerate(self.features)
+                      if spec['encoding'] == 'bit')
+        age_idx = next(idx for idx, spec in enumerate(self.features) if spec['encoding'] == 'age')
+        return np.array([idx for _, idx in bits], dtype=np.int64), age_idx
+
+    @cached_property
+    def raw_indices(self):
+        """Column indices of the features without a bit-packed encoding (continuous values)"""
+        import numpy as np
+        return np.array([idx for idx, spec in enumerate(self.features)
+                         if spec['encoding'] == 'raw'], dtype=np.int64)
+
+    @cached_property
+    def bounds(self):
+        """(min, max) arrays over the features, float64"""
+        import numpy as np
+        return (np.array([spec['min'] for spec in self.features], dtype=np.float64),
+                np.array([spec['max'] for spec in self.features], dtype=np.float64))
+
+    @cached_property
+    def binary_mask(self):
+        """True for the 0/1 features"""
+        import numpy as np
+        return np.array([spec['kind'] == 'binary' for spec in self.features])
+
+    @cached_property
+    def required_mask(self):
+        """True for the features that have no default when a caller opts in to absent symptoms being 0"""
+        return ~self.binary_mask
+
+    def to_dict(self):
+        return {'version': SCHEMA_VERSION, 'target_column': self.target_column,
+                'features': self.features}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['features'], data.get('target_column'))
+
+    def save(self, path=FEATURE_SCHEMA_PATH):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=FEATURE_SCHEMA_PATH):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_feature_names(cls, feature_names, target_column=None, settings=None):
+        """
+        Schema for artifacts trained before feature_schema.json existed: every
+        feature except Age is a 0/1 symptom or risk factor.
+        """
+        is_age = [name == AGE_FEATURE for name in feature_names]
+        stats = {
+            'binary': [not age for age in is_age],
+            'integer': [True] * len(feature_names),
+            'min': [18 if age else 0 for age in is_age],
+            'max': [100 if age else 1 for age in is_age],
+        }
+        return build_feature_schema(feature_names, target_column, stats, settings)
+
+
+def load_feature_schema(feature_names, path=FEATURE_SCHEMA_PATH, target_column=None):
+    """The saved schema when it matches feature_names, else the fallback schema"""
+    if os.path.exists(path):
+        schema = FeatureSchema.load(path)
+        if schema.names == list(feature_names):
+            return schema
+    return FeatureSchema.from_feature_names(list(feature_names), target_column)
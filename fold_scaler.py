@@ -0,0 +1,133 @@
+"""
+Heart Disease Prediction - Scaler Folding
+Absorbs the StandardScaler into the ensemble members so that raw (unscaled)
+feature vectors can be passed straight to the model.
+
+Run after train_model.py (train_model.py also exports it automatically):
+    python fold_scaler.py
+"""
+
+import copy
+import json
+import os
+
+import numpy as np
+import joblib
+
+from risk_table import artifact_digest
+
+# ===============================
+# Configuration
+# ===============================
+MODEL_PATH = 'heart_model.pkl'
+SCALER_PATH = 'scaler.pkl'
+RAW_MODEL_PATH = 'heart_model_raw.pkl'
+
+
+def _raw_thresholds(threshold, feature, mean, scale, strict):
+    """
+    Map split thresholds from scaled space (t) to raw space (t*s + m).
+
+    All model inputs are whole numbers, and SMOTE/histogram splits often land
+    exactly on one (e.g. Age < 44). For those thresholds the float rounding of
+    t*s + m could send that integer down the other branch, so the branch taken
+    by the scaled model for the integer is replayed and the raw threshold is
+    placed half a unit away from it. strict=True is XGBoost (x < t on float32),
+    strict=False is scikit-learn (float32 x <= float64 t).
+    """
+    raw = threshold * scale[feature] + mean[feature]
+    nearest = np.round(raw)
+    near = np.abs(raw - nearest) < 1e-4
+
+    x_scaled = ((nearest - mean[feature]) / scale[feature]).astype(np.float32)
+    if strict:
+        goes_left = x_scaled < threshold.astype(np.float32)
+        snapped = np.where(goes_left, nearest + 0.5, nearest)
+    else:
+        goes_left = x_scaled.astype(np.float64) <= threshold
+        snapped = np.where(goes_left, nearest, nearest - 0.5)
+    return np.where(near, snapped, raw)
+
+
+def _fold_linear(estimator, mean, scale):
+    """w.(x - m)/s + b  ==  (w/s).x + (b - w.m/s)"""
+    coef = estimator.coef_ / scale
+    estimator.intercept_ = estimator.intercept_ - coef @ mean
+    estimator.coef_ = coef
+
+
+def _fold_sklearn_trees(estimator, mean, scale):
+    """Rewrite the split threshold of every internal node in every tree"""
+    for tree in estimator.estimators_:
+        feature = tree.tree_.feature
+        internal = feature >= 0
+        # tree_.threshold is a writable view on the node array
+        threshold = tree.tree_.threshold
+        threshold[internal] = _raw_thresholds(
+            threshold[internal], feature[internal], mean, scale, strict=False
+        )
+
+
+def _fold_xgboost_trees(estimator, mean, scale):
+    """Rewrite split_conditions of every internal node in the booster JSON"""
+    booster = estimator.get_booster()
+    model_json = json.loads(booster.save_raw(raw_format='json'))
+    for tree in model_json['learner']['gradient_booster']['model']['trees']:
+        left = np.asarray(tree['left_children'])
+        feature = np.asarray(tree['split_indices'])
+        condition = np.asarray(tree['split_conditions'], dtype=np.float64)
+        internal = left != -1
+        condition[internal] = _raw_thresholds(
+            condition[internal], feature[internal], mean, scale, strict=True
+        )
+        tree['split_conditions'] = condition.tolist()
+    booster.load_model(bytearray(json.dumps(model_json).encode()))
+
+
+def fold_scaler_into_ensemble(model, scaler):
+    """
+    Return a copy of the VotingClassifier that accepts raw feature rows.
+
+    The scaler is an affine map with positive scale, so it is absorbed exactly:
+    into the coefficients/intercept of the Logistic Regression member and into
+    the split thresholds of the Random Forest and XGBoost members (the order of
+    values along each feature is unchanged, so every tree keeps its shape).
+    """
+    folded = copy.deepcopy(model)
+    mean = np.asarray(scaler.mean_, dtype=np.float64)
+    scale = np.asarray(scaler.scale_, dtype=np.float64)
+
+    for estimator in folded.estimators_:
+        if hasattr(estimator, 'coef_'):
+            _fold_linear(estimator, mean, scale)
+        elif hasattr(estimator, 'get_booster'):
+            _fold_xgboost_trees(estimator, mean, scale)
+        elif hasattr(estimator, 'estimators_'):
+            _fold_sklearn_trees(estimator, mean, scale)
+        else:
+            raise TypeError(f"Cannot fold scaler into {type(estimator).__name__}")
+    return folded
+
+
+def export_raw_model(model, scaler, model_digest, raw_model_path=RAW_MODEL_PATH):
+    """Fold the scaler, save the raw-feature model with the digest it was built from and return it"""
+    raw_model = fold_scaler_into_ensemble(model, scaler)
+    joblib.dump({'model': raw_model, 'model_digest': model_digest}, raw_model_path)
+    return raw_model
+
+
+def load_raw_model(model_digest, raw_model_path=RAW_MODEL_PATH):
+    """Load the folded model, or None when missing or exported from other artifacts"""
+    if not os.path.exists(raw_model_path):
+        return None
+    artifact = joblib.load(raw_model_path)
+    if artifact.get('model_digest') != model_digest:
+        return None
+    return artifact['model']
+
+
+if __name__ == '__main__':
+    model = joblib.load(MODEL_PATH)
+    scaler = joblib.load(SCALER_PATH)
+    export_raw_model(model, scaler, artifact_digest([MODEL_PATH, SCALER_PATH]))
+    print(f"✓ Raw-feature model saved to {RAW_MODEL_PATH}")
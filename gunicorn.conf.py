@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for the inference API (app.py)
+
+    gunicorn -c gunicorn.conf.py app:app
+
+The app is preloaded in the master process, so the compiled model and the
+memory-mapped risk table are loaded once and shared by all workers. The
+pickled ensemble is only unpickled in a worker that needs it (explanations,
+fallback scoring).
+Each worker serves requests on a small thread pool.
+"""
+
+from settings import SETTINGS
+
+bind = f"{SETTINGS.get('HOST', '0.0.0.0')}:{SETTINGS.get('PORT', 5000)}"
+workers = SETTINGS.get('WORKERS', 4)
+threads = SETTINGS.get('THREADS', 8)
+worker_class = 'gthread'
+preload_app = True
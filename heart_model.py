@@ -6,7 +6,9 @@ import seaborn as sns
 # ===============================
 # 1. Load Dataset
 # ===============================
-data = pd.read_csv("heart.csv")
+from dataset import load_dataset
+
+data = load_dataset("heart.csv")
 print(data.head())
 
 # ===============================
@@ -146,12 +148,17 @@ with open('scaler.pkl', 'wb') as f:
 print("✓ Scaler saved as scaler.pkl")
 
 # ===============================
-# 12. Explainable AI using SHAP
+# 12. Explainable AI (feature contributions)
 # ===============================
-import shap
+from explanations import ExplanationEngine
+
+print("\nGenerating explanations...")
 
-print("\nGenerating SHAP explanations...")
+# SHAP values (TreeSHAP for the tree members) for all three ensemble members
+explainer = ExplanationEngine(ensemble, sc, X.columns)
+print("✓ Explainer created successfully")
 
-# Create SHAP explainer for XGBoost
-explainer = shap.Explainer(xgb_model, X_train[:100])  # Use subset for speed
-print("✓ SHAP explainer created successfully")
+contributions, base_values = explainer.contributions(sc.inverse_transform(X_test[:100]))
+mean_impact = pd.Series(np.abs(contributions).mean(axis=0), index=X.columns)
+print("\nMean absolute contribution (top 5):")
+print(mean_impact.sort_values(ascending=False).head())
@@ -0,0 +1,120 @@
+"""
+Heart Disease Prediction - Inference Helpers
+Single-pass scoring for the soft-voting ensemble
+"""
+
+import numpy as np
+import pandas as pd
+
+from compiled_model import compiled_predict_proba
+from feature_encoding import patient_keys
+from risk_table import lookup_risk
+
+# Above this many rows the (multi-threaded) scikit-learn/XGBoost predict_proba
+# of the scaler-folded model beats the single-threaded NumPy evaluator.
+COMPILED_MAX_ROWS = 1024
+
+# Risk bands on P(heart disease), as shown in the Streamlit risk indicator
+RISK_LEVEL_BOUNDS = [0.3, 0.7]
+RISK_LEVEL_LABELS = np.array(['Low Risk', 'Moderate Risk', 'High Risk'])
+
+
+def risk_levels(positive):
+    """Vectorized risk band label for each positive-class probability"""
+    return RISK_LEVEL_LABELS[np.searchsorted(RISK_LEVEL_BOUNDS, positive, side='right')]
+
+
+def labels_from_proba(proba, classes, threshold=None):
+    """
+    Derive class labels from class probabilities.
+      - threshold=None: argmax over classes (identical to model.predict)
+      - threshold=t:    positive class when P(class 1) >= t
+    """
+    if threshold is None:
+        return classes[np.argmax(proba, axis=1)]
+    return (proba[:, 1] >= threshold).astype(int)
+
+
+def predict_with_proba(model, X_scaled, threshold=None):
+    """
+    Return class labels and class probabilities from a single predict_proba call.
+
+    VotingClassifier.predict() with soft voting recomputes predict_proba() of every
+    member, so calling predict() and predict_proba() back to back evaluates the
+    Logistic Regression, Random Forest and XGBoost models twice. Here the labels
+    are derived from the probabilities instead.
+    """
+    proba = model.predict_proba(X_scaled)
+    return labels_from_proba(proba, model.classes_, threshold), proba
+
+
+def bundle_classes(bundle):
+    """
+    Class labels of the served model, from the compiled metadata when present
+    so that scoring from the compiled arrays never unpickles the ensemble.
+    """
+    for key in ('student_model', 'compiled_model'):
+        if bundle.get(key) is not None:
+            return bundle[key]['classes']
+    return bundle['model'].classes_
+
+
+def score_patients(bundle, X, threshold=None, use_cache=True):
+    """
+    Score raw (unscaled) feature rows given in bundle['feature_names'] order.
+
+    Each row is answered by the cheapest source that has it:
+      1. the precomputed risk table (array lookup),
+      2. the bundle's prediction cache (keyed on the canonical patient key),
+      3. the distilled student (bundle['student_model']) when the bundle was
+         loaded for student serving, otherwise the ensemble, in one batch for
+         all remaining rows, preferring the pure-NumPy compiled model (up to
+         COMPILED_MAX_ROWS rows), then the scaler-folded model (both take raw
+         rows), then scaler + original model. These results are added to the cache.
+         The pickled models are only unpickled (model_loader.ModelBundle) when
+         one of these fallbacks is taken.
+    Bulk scoring of mostly unique rows should pass use_cache=False so it does
+    not pay for cache bookkeeping or evict the interactive entries.
+    Returns (labels, probabilities) like predict_with_proba().
+    """
+    X = np.asarray(X, dtype=np.float64)
+    feature_names = bundle['feature_names']
+    # The compiled schema carries the bit layout of the packed cache keys
+    key_layout = bundle.get('feature_schema') or feature_names
+
+    if bundle.get('risk_table') is not None:
+        positive, hit = lookup_risk(bundle['risk_table'], X)
+    else:
+        positive, hit = np.full(len(X), np.nan), np.zeros(len(X), dtype=bool)
+
+    miss = np.flatnonzero(~hit)
+    cache = bundle.get('prediction_cache') if use_cache else None
+    if len(miss) and cache is not None:
+        keys, valid = patient_keys(X[miss], key_layout)
+        cached, found = cache.get_many(keys[valid])
+        cached_rows = miss[valid][found]
+        positive[cached_rows] = cached[found]
+        hit[cached_rows] = True
+        miss = np.flatnonzero(~hit)
+
+    if len(miss):
+        compiled = bundle.get('compiled_model')
+        if bundle.get('student_model') is not None:
+            positive[miss] = compiled_predict_proba(bundle['student_model'], X[miss])[:, 1]
+        elif compiled is not None and len(miss) <= COMPILED_MAX_ROWS:
+            positive[miss] = compiled_predict_proba(compiled, X[miss])[:, 1]
+        elif bundle.get('raw_model') is not None:
+            positive[miss] = bundle['raw_model'].predict_proba(X[miss])[:, 1]
+        elif compiled is not None:
+            positive[miss] = compiled_predict_proba(compiled, X[miss])[:, 1]
+        else:
+            X_scaled = bundle['scaler'].transform(
+                pd.DataFrame(X[miss], columns=feature_names)
+            )
+            positive[miss] = bundle['model'].predict_proba(X_scaled)[:, 1]
+        if cache is not None:
+            keys, valid = patient_keys(X[miss], key_layout)
+            cache.put_many(keys[valid], positive[miss][valid])
+
+    proba = np.column_stack([1.0 - positive, positive])
+    return labels_from_proba(proba, bundle_classes(bundle), threshold), proba
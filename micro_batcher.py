@@ -0,0 +1,106 @@
+"""
+Heart Disease Prediction - Micro-Batcher
+Coalesces concurrent single-patient requests into one vectorized model call
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+# ===============================
+# Configuration
+# ===============================
+BATCH_WINDOW_MS = 2.0
+BATCH_MAX_SIZE = 256
+
+
+class MicroBatcher:
+    """
+    Collects rows submitted by many threads and scores them together.
+
+    A background thread takes the first pending row, then keeps collecting
+    until either max_batch_size rows are queued or window_ms has passed since
+    that first row. The stacked matrix is scored with one call of
+    score_fn(X) -> (labels, probabilities) and each caller's Future receives
+    its own (label, probability_row).
+
+    The worker thread is started on first use in each process, so an instance
+    created before a pre-fork server (gunicorn preload_app) forks still works
+    in every worker.
+    """
+
+    def __init__(self, score_fn, window_ms=BATCH_WINDOW_MS, max_batch_size=BATCH_MAX_SIZE):
+        self.score_fn = score_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.rows = 0
+        self._queue = None
+        self._pid = None
+        # guards the worker start and the batches/rows counters read by stats()
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self.batches = self.rows = 0
+            threading.Thread(target=self._run, args=(self._queue,),
+                             name='micro-batcher', daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, row):
+        """Queue one raw feature row; returns a Future of (label, probabilities)"""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((row, future))
+        return future
+
+    def predict(self, row, timeout=None):
+        """Blocking convenience wrapper around submit()"""
+        return self.submit(row).result(timeout)
+
+    def stats(self):
+        with self._lock:
+            batches, rows = self.batches, self.rows
+        return {
+            'batches': batches,
+            'rows': rows,
+            'mean_batch_size': rows / batches if batches else 0.0,
+        }
+
+    def _collect(self, pending_queue):
+        pending = [pending_queue.get()]
+        deadline = time.perf_counter() + self.window
+        while len(pending) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(pending_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return pending
+
+    def _run(self, pending_queue):
+        while True:
+            pending = self._collect(pending_queue)
+            rows, futures = zip(*pending)
+            try:
+                labels, proba = self.score_fn(np.vstack(rows))
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            with self._lock:
+                self.batches += 1
+                self.rows += len(futures)
+            for i, future in enumerate(futures):
+                future.set_result((labels[i], proba[i]))
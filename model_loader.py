@@ -0,0 +1,176 @@
+"""
+Heart Disease Prediction - Model Bundle Loader
+Process-wide cache for the trained ensemble, scaler and feature information
+"""
+
+import os
+import threading
+import joblib
+
+from compiled_model import COMPILED_MODEL_PATH, load_compiled_model
+from feature_schema import FEATURE_SCHEMA_PATH, load_feature_schema
+from fold_scaler import RAW_MODEL_PATH, load_raw_model
+from prediction_cache import PredictionCache
+from risk_table import (
+    RISK_TABLE_PATH, RISK_TABLE_META_PATH, artifact_digest, load_risk_table
+)
+
+# ===============================
+# Configuration
+# ===============================
+MODEL_PATH = 'heart_model.pkl'
+SCALER_PATH = 'scaler.pkl'
+FEATURE_INFO_PATH = 'feature_info.pkl'
+
+# One bundle per set of artifact paths, shared by every
+# session/thread of the process. The lock makes sure concurrent sessions that
+# miss the cache at the same time only unpickle the artifacts once.
+_bundle_cache = {}
+_bundle_lock = threading.Lock()
+
+
+def artifact_signature(paths, optional_paths=()):
+    """Return (path, mtime, size) for each artifact so changes on disk are detected"""
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+    for path in optional_paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            signature.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+        else:
+            signature.append((os.path.abspath(path), None, None))
+    return tuple(signature)
+
+
+class ModelBundle(dict):
+    """
+    The bundle dict, with the scikit-learn/XGBoost artifacts unpickled on first access.
+
+    'model', 'scaler' and 'raw_model' are only needed when the compiled arrays
+    cannot answer (no compiled export, large batches, explanations), so a
+    process that scores from heart_model_compiled.npz alone never imports
+    scikit-learn or xgboost.
+    """
+
+    def __init__(self, entries, loaders):
+        super().__init__(entries)
+        self._loaders = loaders
+        self._lock = threading.Lock()
+
+    def __missing__(self, key):
+        if key not in self._loaders:
+            raise KeyError(key)
+        with self._lock:
+            if not self.loaded(key):
+                self[key] = self._loaders[key]()
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def loaded(self, key):
+        """Whether key is set without running its loader"""
+        return dict.__contains__(self, key)
+
+
+def load_model_bundle(model_path=MODEL_PATH, scaler_path=SCALER_PATH,
+                      feature_info_path=FEATURE_INFO_PATH,
+                      risk_table_path=RISK_TABLE_PATH, risk_table_meta_path=RISK_TABLE_META_PATH,
+                      raw_model_path=RAW_MODEL_PATH, compiled_model_path=COMPILED_MODEL_PATH,
+                      student_model_path=None, feature_schema_path=FEATURE_SCHEMA_PATH,
+                      compiled_only=False):
+    """
+    Load trained model, scaler, and feature information once per process.
+
+    The cached bundle is returned as long as the artifact files are unchanged;
+    retraining (which rewrites the .pkl files) triggers a reload on next call.
+    The precomputed risk table (risk_table.py) is attached when present and
+    built from the same model and scaler, otherwise bundle['risk_table'] is None.
+    The same holds for the scaler-folded model (fold_scaler.py) in
+    bundle['raw_model'], which takes unscaled feature rows directly, and for
+    its array export (compiled_model.py) in bundle['compiled_model'].
+    Passing student_model_path (distill_model.py output) serves the distilled
+    student instead of the ensemble: bundle['student_model'] is set when the
+    student was distilled from this model and scaler.
+    bundle['feature_schema'] is the compiled feature schema (feature_schema.py),
+    derived from the feature names when feature_schema.json is missing.
+    Each bundle carries its own prediction cache, so a reload also drops every
+    probability memoized for the previous model.
+
+    bundle['model'], bundle['scaler'] and bundle['raw_model'] are unpickled on
+    first access (ModelBundle). With compiled_only=True and a compiled (or
+    student) model present, bundle['raw_model'] is None, so scoring never
+    falls back to the pickled models. A first access after the artifacts
+    changed on disk (a retrain since the bundle was loaded) raises
+    RuntimeError instead of pairing a new model with the old compiled or
+    folded artifacts; the bundle is dropped from the cache, so the next
+    load_model_bundle() call reloads all of it.
+    """
+    paths = (model_path, scaler_path, feature_info_path)
+    optional_paths = (risk_table_path, risk_table_meta_path, raw_model_path, compiled_model_path,
+                      feature_schema_path)
+    if student_model_path is not None:
+        optional_paths += (student_model_path,)
+    cache_key = tuple(os.path.abspath(path) for path in paths + optional_paths) + (compiled_only,)
+    signature = artifact_signature(paths, optional_paths)
+
+    bundle = _bundle_cache.get(cache_key)
+    if bundle is not None and bundle['signature'] == signature:
+        return bundle
+
+    with _bundle_lock:
+        # Another session may have loaded the bundle while we were waiting
+        bundle = _bundle_cache.get(cache_key)
+        if bundle is not None and bundle['signature'] == signature:
+            return bundle
+
+        feature_info = joblib.load(feature_info_path)
+        feature_names = feature_info['feature_names'] if feature_info else []
+        model_digest = artifact_digest([model_path, scaler_path])
+        feature_schema = load_feature_schema(feature_names, feature_schema_path,
+                                             (feature_info or {}).get('target_column'))
+        entries = {
+            'feature_info': feature_info,
+            'feature_names': feature_names,
+            'feature_schema': feature_schema,
+            'compiled_model': load_compiled_model(model_digest, compiled_model_path),
+            'student_model': (load_compiled_model(model_digest, student_model_path)
+                              if student_model_path is not None else None),
+            'risk_table': load_risk_table(model_digest, feature_schema,
+                                          risk_table_path, risk_table_meta_path),
+            'prediction_cache': PredictionCache(),
+            'signature': signature,
+        }
+        if compiled_only and (entries['compiled_model'] is not None
+                              or entries['student_model'] is not None):
+            entries['raw_model'] = None
+        def unchanged(load):
+            """Wrap a lazy loader with a check of the artifact signature"""
+            def loader():
+                if artifact_signature(paths, optional_paths) != signature:
+                    with _bundle_lock:
+                        if _bundle_cache.get(cache_key) is bundle:
+                            del _bundle_cache[cache_key]
+                    raise RuntimeError("Model artifacts changed on disk since the bundle was "
+                                       "loaded; reload it with load_model_bundle()")
+                return load()
+            return loader
+
+        bundle = ModelBundle(entries, {
+            'model': unchanged(lambda: joblib.load(model_path)),
+            'scaler': unchanged(lambda: joblib.load(scaler_path)),
+            'raw_model': unchanged(lambda: load_raw_model(model_digest, raw_model_path)),
+        })
+        _bundle_cache[cache_key] = bundle
+        return bundle
+
+
+def clear_model_cache():
+    """Drop every cached bundle (next load reads the artifacts from disk)"""
+    with _bundle_lock:
+        _bundle_cache.clear()
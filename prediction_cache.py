@@ -0,0 +1,85 @@
+"""
+Heart Disease Prediction - Prediction Cache
+Bounded LRU/TTL cache of P(heart disease) keyed on canonical patient keys
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# ===============================
+# Configuration
+# ===============================
+CACHE_MAX_ENTRIES = 50000
+CACHE_TTL_SECONDS = 3600
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache with per-entry expiry.
+
+    Keys are the integers produced by feature_encoding.patient_keys(); values are
+    the positive-class probability. One instance lives in each model bundle, so
+    it is shared by every session and discarded together with a stale model.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl_seconds=CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """Return (values, found) arrays; values are NaN where found is False"""
+        values = np.full(len(keys), np.nan)
+        found = np.zeros(len(keys), dtype=bool)
+        now = time.monotonic()
+        with self._lock:
+            for i, key in enumerate(keys.tolist()):
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at < now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                values[i] = value
+                found[i] = True
+            hits = int(found.sum())
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return values, found
+
+    def put_many(self, keys, values):
+        """Insert or refresh entries, evicting the least recently used ones"""
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for key, value in zip(keys.tolist(), values.tolist()):
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
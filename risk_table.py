@@ -0,0 +1,172 @@
+"""
+Heart Disease Prediction - Precomputed Risk Lookup Table
+Evaluates the ensemble over every combination of the binary features and
+every age in [MIN_AGE, MAX_AGE], so serving becomes a single array lookup.
+
+Run after train_model.py:
+    python risk_table.py [--min-age 18] [--max-age 100]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import joblib
+
+from feature_encoding import pack_features, split_feature_indices, unpack_features
+from feature_schema import load_feature_schema
+
+warnings.filterwarnings('ignore')
+
+# ===============================
+# Configuration
+# ===============================
+MODEL_PATH = 'heart_model.pkl'
+SCALER_PATH = 'scaler.pkl'
+FEATURE_INFO_PATH = 'feature_info.pkl'
+RISK_TABLE_PATH = 'risk_table.npy'
+RISK_TABLE_META_PATH = 'risk_table.json'
+MIN_AGE = 18   # config.py MIN_AGE
+MAX_AGE = 100  # config.py MAX_AGE
+# float16 rounding (up to 2.4e-4) flipped labels next to the 0.5 threshold
+TABLE_DTYPE = np.float32
+
+
+def artifact_digest(paths):
+    """SHA-256 over the contents of the model artifacts the table was built from"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def bit_features(feature_names):
+    """Feature names in bitmask order, as packed by feature_encoding over this layout"""
+    return [feature_names[idx] for idx in split_feature_indices(feature_names)[0]]
+
+
+def build_risk_table(model, scaler, feature_names, model_digest,
+                     table_path=RISK_TABLE_PATH, meta_path=RISK_TABLE_META_PATH,
+                     min_age=MIN_AGE, max_age=MAX_AGE):
+    """
+    Score the full input space and write P(heart disease) as a float32 table.
+
+    Row r holds age min_age + r, column c holds the patient whose binary features
+    are bit-packed into c (see feature_encoding.pack_features) over the
+    feature_names layout; the meta records that layout so lookups can check
+    they pack rows the same way. Every age is one
+    vectorized batch of 2^n_bits rows. The table is written to a temporary file
+    and renamed into place so running servers never see a half-written table.
+    """
+    n_bits = len(split_feature_indices(feature_names)[0])
+    n_codes = 1 << n_bits
+    ages = np.arange(min_age, max_age + 1)
+    codes = np.arange(n_codes, dtype=np.int64)
+
+    tmp_path = table_path + '.tmp'
+    table = np.lib.format.open_memmap(
+        tmp_path, mode='w+', dtype=TABLE_DTYPE, shape=(len(ages), n_codes)
+    )
+    for row, age in enumerate(ages):
+        X = unpack_features(codes, np.full(n_codes, age), feature_names)
+        X_scaled = scaler.transform(pd.DataFrame(X, columns=feature_names))
+        table[row] = model.predict_proba(X_scaled)[:, 1]
+    table.flush()
+    del table
+    os.replace(tmp_path, table_path)
+
+    meta = {
+        'feature_names': list(feature_names),
+        'min_age': int(min_age),
+        'max_age': int(max_age),
+        'n_bits': n_bits,
+        'bit_features': bit_features(feature_names),
+        'model_digest': model_digest,
+    }
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def load_risk_table(model_digest, feature_names, table_path=RISK_TABLE_PATH,
+                    meta_path=RISK_TABLE_META_PATH):
+    """
+    Memory-map a previously built table for the feature_names layout (the
+    FeatureSchema lookups pack rows with).
+
+    Returns None when the table does not exist, was built from a different
+    model/scaler than the one being served or with another feature or bit order.
+    """
+    if not (os.path.exists(table_path) and os.path.exists(meta_path)):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get('model_digest') != model_digest:
+        return None
+    if (meta.get('feature_names') != list(feature_names)
+            or meta.get('bit_features') != bit_features(feature_names)):
+        return None
+    risk_table = dict(meta, layout=feature_names)
+    risk_table['table'] = np.load(table_path, mmap_mode='r')
+    return risk_table
+
+
+def lookup_risk(risk_table, X):
+    """
+    Look up P(heart disease) for raw feature rows.
+
+    Returns (probabilities, hit). Rows with hit=False (age outside the table,
+    or non 0/1 binary values) get NaN and must be scored by the model. So do
+    rows whose stored value is within the table's rounding error of 0.5, where
+    the rounded value could give a different label than model.predict.
+    """
+    bits, ages, valid = pack_features(X, risk_table['layout'])
+    hit = valid & (ages >= risk_table['min_age']) & (ages <= risk_table['max_age'])
+
+    proba = np.full(len(bits), np.nan)
+    if hit.any():
+        rows = ages[hit] - risk_table['min_age']
+        table = risk_table['table']
+        values = table[rows, bits[hit]].astype(np.float64)
+        ambiguous = np.abs(values - 0.5) <= np.finfo(table.dtype).eps
+        proba[hit] = np.where(ambiguous, np.nan, values)
+        hit[np.flatnonzero(hit)[ambiguous]] = False
+    return proba, hit
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the precomputed risk lookup table')
+    parser.add_argument('--min-age', type=int, default=MIN_AGE)
+    parser.add_argument('--max-age', type=int, default=MAX_AGE)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("HEART DISEASE PREDICTION - RISK LOOKUP TABLE")
+    print("=" * 80)
+
+    model = joblib.load(MODEL_PATH)
+    scaler = joblib.load(SCALER_PATH)
+    feature_info = joblib.load(FEATURE_INFO_PATH)
+    feature_names = load_feature_schema(feature_info['feature_names'],
+                                        target_column=feature_info.get('target_column'))
+    n_bits = len(split_feature_indices(feature_names)[0])
+    n_rows = (args.max_age - args.min_age + 1) << n_bits
+    print(f"✓ Scoring {n_rows:,} input combinations "
+          f"(ages {args.min_age}-{args.max_age}, {n_bits} binary features)")
+
+    start = time.perf_counter()
+    build_risk_table(
+        model, scaler, feature_names,
+        artifact_digest([MODEL_PATH, SCALER_PATH]),
+        min_age=args.min_age, max_age=args.max_age
+    )
+    elapsed = time.perf_counter() - start
+    print(f"✓ Table saved to {RISK_TABLE_PATH} ({os.path.getsize(RISK_TABLE_PATH) / 1e6:.1f} MB) "
+          f"in {elapsed:.1f}s")
@@ -0,0 +1,39 @@
+"""
+Heart Disease Prediction - Settings
+Reads the KEY=VALUE entries of config.py. The configuration template is not
+importable Python (HOST=0.0.0.0, DATABASE_URL=sqlite:///...), so each value is
+parsed as a Python literal when possible and kept as a string otherwise.
+Environment variables with the same name override the file.
+"""
+
+import ast
+import os
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.py')
+
+
+def _parse_value(raw):
+    try:
+        return ast.literal_eval(raw)
+    except (ValueError, SyntaxError):
+        return raw
+
+
+def load_settings(path=CONFIG_PATH):
+    """Return a dict of every KEY=VALUE setting in config.py, with env overrides"""
+    settings = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#') or '=' not in line:
+                    continue
+                key, value = line.split('=', 1)
+                settings[key.strip()] = _parse_value(value.strip())
+    for key in settings:
+        if key in os.environ:
+            settings[key] = _parse_value(os.environ[key])
+    return settings
+
+
+SETTINGS = load_settings()
@@ -0,0 +1,249 @@
+"""
+Heart Disease Prediction - Out-of-Core Training
+Streaming variant of the training pipeline for datasets larger than RAM.
+
+The CSV is never loaded as a whole; every stage is a pass over typed chunks
+(dataset.py):
+    1. scaling pass   - StandardScaler.partial_fit, class counts and the column
+                         stats for the feature schema
+    2. Logistic member - SGDClassifier(loss='log_loss') trained with partial_fit
+    3. XGBoost member  - trained from an external-memory matrix fed by a
+                         DataIter (pages are spilled to disk, not RAM)
+    4. test pass      - evaluation of the members and the ensemble
+Instead of materializing SMOTE samples, the classes are balanced by weighting
+every row with n_rows / (n_classes * n_rows_of_its_class). The Random Forest
+member needs the full table in memory and is left out of this mode.
+
+The exported artifacts are the same as train_model.py's (a soft-voting
+VotingClassifier plus scaler), so serving is unchanged:
+    python train_model.py --streaming [--chunk-size ROWS]
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import xgboost
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBClassifier
+
+from artifact_cache import ARTIFACT_CACHE_DIR, ArtifactCache
+from dataset import dataset_schema, find_target_column, iter_csv_chunks, read_header
+from feature_schema import column_stats
+from risk_table import artifact_digest
+from train_model import (
+    DATASET_PATH, MODEL_LABELS, MODEL_PARAMS, RANDOM_STATE, TEST_SIZE, build_ensemble,
+    classification_metrics, export_artifacts, export_is_current, print_comparison,
+    print_ensemble_report
+)
+
+# ===============================
+# Configuration
+# ===============================
+STREAM_CHUNK_SIZE = 100000
+SGD_EPOCHS = 5
+SGD_PARAMS = {'loss': 'log_loss', 'alpha': 1e-4, 'random_state': RANDOM_STATE}
+XGB_MAX_BIN = 256
+N_STREAM_STAGES = 5
+
+
+class ChunkStream:
+    """
+    Re-iterable (X, y) chunks of the training or test rows of a CSV.
+
+    Rows are assigned to the test split with probability TEST_SIZE from a
+    fixed-seed generator consumed row by row, so every pass (and every chunk
+    size) sees the same split without keeping an index of it.
+    """
+
+    def __init__(self, path, part, chunk_size=STREAM_CHUNK_SIZE):
+        self.path = path
+        self.part = part
+        self.chunk_size = chunk_size
+        header = read_header(path)
+        self.schema = dataset_schema(header)
+        self.target_col = find_target_column(header)
+        self.feature_names = [col for col in header if col != self.target_col]
+
+    def __iter__(self):
+        rng = np.random.default_rng(RANDOM_STATE)
+        for chunk in iter_csv_chunks(self.path, self.schema, self.chunk_size):
+            is_test = rng.random(len(chunk)) < TEST_SIZE
+            rows = chunk[is_test] if self.part == 'test' else chunk[~is_test]
+            if len(rows):
+                X = rows[self.feature_names].astype('float64')  # NA -> NaN
+                yield X, rows[self.target_col].to_numpy(dtype=np.int64)
+
+
+def scale_chunk(scaler, X):
+    """Standardize a chunk; missing values become 0, i.e. are filled with the training mean"""
+    X_scaled = scaler.transform(X)
+    X_scaled[np.isnan(X_scaled)] = 0.0
+    return X_scaled
+
+
+def fit_scaler_streaming(train_stream):
+    """First pass: incremental StandardScaler (NaN-aware), class counts and column stats"""
+    scaler = StandardScaler()
+    counts = np.zeros(2, dtype=np.int64)
+    stats = None
+    for X, y in train_stream:
+        scaler.partial_fit(X)
+        counts += np.bincount(y, minlength=2)[:2]
+        stats = column_stats(X, stats)
+    classes = np.flatnonzero(counts)
+    return {
+        'scaler': scaler,
+        'classes': classes,
+        'class_counts': counts,
+        'class_weights': counts.sum() / (len(classes) * np.maximum(counts, 1)),
+        'feature_names': train_stream.feature_names,
+        'target_col': train_stream.target_col,
+        'feature_stats': stats,
+    }
+
+
+def fit_sgd_streaming(train_stream, prep, params=SGD_PARAMS, epochs=SGD_EPOCHS):
+    """Logistic member: SGD with log loss over epochs x chunks, rows shuffled within each chunk"""
+    model = SGDClassifier(**params)
+    rng = np.random.default_rng(RANDOM_STATE)
+    for _ in range(epochs):
+        for X, y in train_stream:
+            order = rng.permutation(len(y))
+            model.partial_fit(scale_chunk(prep['scaler'], X)[order], y[order],
+                              classes=prep['classes'],
+                              sample_weight=prep['class_weights'][y[order]])
+    return model
+
+
+class ScaledChunkIter(xgboost.DataIter):
+    """Feeds scaled, class-weighted training chunks to XGBoost's external-memory matrix"""
+
+    def __init__(self, train_stream, prep, cache_prefix):
+        super().__init__(cache_prefix=cache_prefix)
+        self._stream = train_stream
+        self._prep = prep
+        self._chunks = None
+
+    def reset(self):
+        self._chunks = iter(self._stream)
+
+    def next(self, input_data):
+        if self._chunks is None:
+            self.reset()
+        try:
+            X, y = next(self._chunks)
+        except StopIteration:
+            return False
+        input_data(data=scale_chunk(self._prep['scaler'], X), label=y,
+                   weight=self._prep['class_weights'][y])
+        return True
+
+
+def fit_xgboost_streaming(train_stream, prep, params=MODEL_PARAMS['xgboost']):
+    """
+    XGBoost member trained from an external-memory quantile matrix.
+
+    Returned as an XGBClassifier so it slots into the VotingClassifier and the
+    export path like the in-memory member.
+    """
+    booster_params = {key: value for key, value in params.items()
+                      if key not in ('n_estimators', 'random_state')}
+    booster_params.update(objective='binary:logistic', tree_method='hist',
+                          seed=params['random_state'])
+    # ExtMemQuantileDMatrix is xgboost >= 3.0; DMatrix accepts the iterator on 2.x
+    matrix_class = getattr(xgboost, 'ExtMemQuantileDMatrix', None)
+    os.makedirs(ARTIFACT_CACHE_DIR, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='xgb_pages_', dir=ARTIFACT_CACHE_DIR) as page_dir:
+        data_iter = ScaledChunkIter(train_stream, prep, os.path.join(page_dir, 'train'))
+        if matrix_class is not None:
+            dtrain = matrix_class(data_iter, max_bin=XGB_MAX_BIN)
+        else:
+            dtrain = xgboost.DMatrix(data_iter)
+        booster = xgboost.train(booster_params, dtrain, num_boost_round=params['n_estimators'])
+        del dtrain
+    model = XGBClassifier(**params)
+    model.load_model(booster.save_raw(raw_format='ubj'))
+    return model
+
+
+def evaluate_streaming(models, test_stream, scaler):
+    """Metrics per model over the test rows; only labels and predictions are kept in memory"""
+    labels = []
+    preds = {name: [] for name in models}
+    probas = {name: [] for name in models}
+    for X, y in test_stream:
+        X_scaled = scale_chunk(scaler, X)
+        labels.append(y)
+        for name, model in models.items():
+            proba = model.predict_proba(X_scaled)
+            preds[name].append(model.classes_[proba.argmax(axis=1)])
+            probas[name].append(proba[:, 1].astype(np.float32))
+    y_test = np.concatenate(labels)
+    results = {name: classification_metrics(y_test, np.concatenate(preds[name]),
+                                            np.concatenate(probas[name]))
+               for name in models}
+    return results, y_test
+
+
+def main_streaming(force=False, chunk_size=STREAM_CHUNK_SIZE):
+    cache = ArtifactCache()
+    print("=" * 80)
+    print("HEART DISEASE PREDICTION MODEL - STREAMING TRAINING PIPELINE")
+    print("=" * 80)
+
+    if not os.path.exists(DATASET_PATH):
+        print(f"✗ Error: {DATASET_PATH} not found!")
+        exit(1)
+    train_stream = ChunkStream(DATASET_PATH, 'train', chunk_size)
+    test_stream = ChunkStream(DATASET_PATH, 'test', chunk_size)
+
+    print(f"\n[1/{N_STREAM_STAGES}] Scaling pass (StandardScaler.partial_fit, {chunk_size} rows/chunk)...")
+    start = time.perf_counter()
+    prep, prep_key = cache.run('stream_scale', [artifact_digest([DATASET_PATH])],
+                               {'test_size': TEST_SIZE, 'random_state': RANDOM_STATE},
+                               lambda: fit_scaler_streaming(train_stream), force)
+    counts = prep['class_counts']
+    print(f"✓ Training rows: {counts.sum()} (class counts {counts.tolist()}) "
+          f"in {time.perf_counter() - start:.1f}s")
+    print(f"✓ Class weights instead of SMOTE: {np.round(prep['class_weights'], 4).tolist()}")
+
+    members = {}
+    member_keys = {}
+    print(f"\n[2/{N_STREAM_STAGES}] Training {MODEL_LABELS['logistic_regression']} "
+          f"(SGD, {SGD_EPOCHS} epochs)...")
+    start = time.perf_counter()
+    members['logistic_regression'], member_keys['logistic_regression'] = cache.run(
+        'stream_fit_logistic_regression', [prep_key],
+        dict(SGD_PARAMS, epochs=SGD_EPOCHS, chunk_size=chunk_size),
+        lambda: fit_sgd_streaming(train_stream, prep), force)
+    print(f"✓ {MODEL_LABELS['logistic_regression']} fitted in {time.perf_counter() - start:.1f}s")
+
+    print(f"\n[3/{N_STREAM_STAGES}] Training {MODEL_LABELS['xgboost']} (external memory)...")
+    start = time.perf_counter()
+    members['xgboost'], member_keys['xgboost'] = cache.run(
+        'stream_fit_xgboost', [prep_key],
+        dict(MODEL_PARAMS['xgboost'], max_bin=XGB_MAX_BIN, chunk_size=chunk_size),
+        lambda: fit_xgboost_streaming(train_stream, prep), force)
+    print(f"✓ {MODEL_LABELS['xgboost']} fitted in {time.perf_counter() - start:.1f}s")
+
+    print(f"\n[4/{N_STREAM_STAGES}] Evaluating on the test rows...")
+    ensemble_model = build_ensemble(members, prep['classes'])
+    models = dict(members, ensemble=ensemble_model)
+    metrics, y_test = evaluate_streaming(models, test_stream, prep['scaler'])
+    results = {MODEL_LABELS[name]: metrics[name] for name in members}
+    results['Ensemble (Voting)'] = metrics['ensemble']
+    print(f"✓ Test rows: {len(y_test)}")
+    print_ensemble_report(metrics['ensemble'], y_test)
+
+    print(f"\n[5/{N_STREAM_STAGES}] Saving model and scaler...")
+    ensemble_key = cache.key('ensemble', list(member_keys.values()))
+    if not force and export_is_current(ensemble_key):
+        print("✓ Exported artifacts are up to date")
+    else:
+        export_artifacts(ensemble_model, prep['scaler'], prep['feature_names'],
+                         prep['target_col'], prep['feature_stats'], ensemble_key)
+
+    print_comparison(results, prep['feature_names'])
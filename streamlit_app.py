@@ -3,15 +3,26 @@ Heart Disease Prediction - Streamlit Web Application
 Deployed Ensemble Model for Real-time Predictions
 """
 
-import streamlit as st
-import numpy as np
-import pandas as pd
-import joblib
+import time
 import warnings
 from pathlib import Path
 
+import streamlit as st
+
+# numpy/pandas, the inference helpers and the model are imported lazily (or by
+# the warm-up thread, app_warmup.py) so the first page renders without them
+from app_warmup import (
+    load_bundle, load_schema, record_phase, report_startup, start_warmup, startup_timings
+)
+from ui_assets import (
+    info_box, input_section, page_footer, page_header, section_title, stylesheet_html
+)
+
+script_start = time.perf_counter()
 warnings.filterwarnings('ignore')
 
+BULK_CHUNK_SIZE = 5000
+
 # ===============================
 # Page Configuration
 # ===============================
@@ -22,371 +33,21 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Professional Dark Theme Medical Dashboard CSS
-st.markdown("""
-<style>
-    :root {
-        --bg-primary: #0f172a;
-        --bg-secondary: #1a1f3a;
-        --bg-tertiary: #232d4a;
-        --text-primary: #f1f5f9;
-        --text-secondary: #cbd5e1;
-        --text-muted: #94a3b8;
-        --accent-primary: #ef4444;
-        --accent-secondary: #3b82f6;
-        --success: #10b981;
-        --warning: #f59e0b;
-        --border-color: #334155;
-    }
-    
-    * {
-        box-sizing: border-box;
-    }
-    
-    html, body, [data-testid="stAppViewContainer"] {
-        background-color: var(--bg-primary);
-        color: var(--text-primary);
-    }
-    
-    .main {
-        background-color: var(--bg-primary);
-        padding-top: 1.5rem;
-    }
-    
-    /* Header */
-    .header-container {
-        background: linear-gradient(135deg, #1e293b 0%, #0f172a 100%);
-        padding: 2.5rem 2rem;
-        border-radius: 12px;
-        color: var(--text-primary);
-        margin-bottom: 2.5rem;
-        border: 1px solid var(--border-color);
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
-    }
-    
-    .header-container h1 {
-        margin: 0;
-        font-size: 2.2rem;
-        font-weight: 600;
-        letter-spacing: -0.3px;
-        color: var(--text-primary);
-    }
-    
-    .header-container p {
-        margin: 0.75rem 0 0 0;
-        font-size: 1rem;
-        color: var(--text-secondary);
-        font-weight: 400;
-    }
-    
-    /* Tabs */
-    .stTabs {
-        margin-top: 0;
-    }
-    
-    .stTabs [data-baseweb="tab-list"] {
-        border-bottom: 1px solid var(--border-color);
-    }
-    
-    .stTabs [data-baseweb="tab-list"] button {
-        font-size: 0.95rem;
-        font-weight: 500;
-        padding: 1rem 1.25rem;
-        border-radius: 8px 8px 0 0;
-        transition: all 0.2s ease;
-        color: var(--text-muted);
-        border: none;
-        background: transparent;
-    }
-    
-    .stTabs [data-baseweb="tab-list"] button:hover {
-        color: var(--text-secondary);
-        background-color: rgba(148, 163, 184, 0.1);
-    }
-    
-    .stTabs [data-baseweb="tab-list"] button[aria-selected="true"] {
-        color: var(--accent-primary);
-        border-bottom: 2px solid var(--accent-primary);
-        background: transparent;
-    }
-    
-    /* Cards and Containers */
-    .card {
-        background: linear-gradient(135deg, #1a1f3a 0%, #232d4a 100%);
-        padding: 1.75rem;
-        border-radius: 10px;
-        border: 1px solid var(--border-color);
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.4);
-        transition: all 0.2s ease;
-    }
-    
-    .card:hover {
-        border-color: rgba(239, 68, 68, 0.3);
-        box-shadow: 0 8px 24px rgba(239, 68, 68, 0.1);
-    }
-    
-    .metric-card {
-        background: linear-gradient(135deg, #1a1f3a 0%, #232d4a 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        border: 1px solid var(--border-color);
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.4);
-        text-align: center;
-    }
-    
-    .metric-card h3 {
-        margin: 0 0 0.5rem 0;
-        font-size: 1.75rem;
-        font-weight: 600;
-        color: var(--accent-primary);
-    }
-    
-    .metric-card p {
-        margin: 0;
-        font-size: 0.85rem;
-        color: var(--text-muted);
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    
-    .input-section {
-        background: linear-gradient(135deg, #1a1f3a 0%, #232d4a 100%);
-        padding: 2rem;
-        border-radius: 10px;
-        border: 1px solid var(--border-color);
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.4);
-        margin-bottom: 2rem;
-    }
-    
-    .section-title {
-        color: var(--text-primary);
-        font-size: 1.4rem;
-        font-weight: 600;
-        margin-bottom: 1.5rem;
-        display: flex;
-        align-items: center;
-        gap: 0.75rem;
-        padding-bottom: 1rem;
-        border-bottom: 1px solid var(--border-color);
-    }
-    
-    /* Risk Level Styling */
-    .risk-low {
-        background: linear-gradient(135deg, rgba(16, 185, 129, 0.1) 0%, rgba(16, 185, 129, 0.05) 100%);
-        border-left: 4px solid #10b981;
-        padding: 1.5rem;
-        border-radius: 10px;
-        color: #86efac;
-    }
-    
-    .risk-low h3 {
-        margin-top: 0;
-        margin-bottom: 0.5rem;
-        color: #10b981;
-    }
-    
-    .risk-moderate {
-        background: linear-gradient(135deg, rgba(245, 158, 11, 0.1) 0%, rgba(245, 158, 11, 0.05) 100%);
-        border-left: 4px solid #f59e0b;
-        padding: 1.5rem;
-        border-radius: 10px;
-        color: #fbbf24;
-    }
-    
-    .risk-moderate h3 {
-        margin-top: 0;
-        margin-bottom: 0.5rem;
-        color: #f59e0b;
-    }
-    
-    .risk-high {
-        background: linear-gradient(135deg, rgba(239, 68, 68, 0.1) 0%, rgba(239, 68, 68, 0.05) 100%);
-        border-left: 4px solid #ef4444;
-        padding: 1.5rem;
-        border-radius: 10px;
-        color: #fca5a5;
-    }
-    
-    .risk-high h3 {
-        margin-top: 0;
-        margin-bottom: 0.5rem;
-        color: #ef4444;
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        border-radius: 8px;
-        padding: 0.75rem 1.75rem;
-        font-weight: 500;
-        border: none;
-        transition: all 0.2s ease;
-        font-size: 0.95rem;
-        letter-spacing: 0.3px;
-    }
-    
-    .stButton > button:first-child {
-        background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-        color: white;
-        box-shadow: 0 4px 12px rgba(239, 68, 68, 0.3);
-    }
-    
-    .stButton > button:first-child:hover {
-        box-shadow: 0 8px 24px rgba(239, 68, 68, 0.4);
-        transform: translateY(-2px);
-    }
-    
-    .stButton > button:nth-child(2) {
-        background: linear-gradient(135deg, #334155 0%, #1e293b 100%);
-        color: var(--text-primary);
-        border: 1px solid var(--border-color);
-    }
-    
-    .stButton > button:nth-child(2):hover {
-        background: linear-gradient(135deg, #475569 0%, #334155 100%);
-    }
-    
-    /* Sliders and Input Elements */
-    .stSlider [data-testid="stTickBar"] {
-        background: var(--border-color);
-    }
-    
-    /* Sidebar */
-    .stSidebar {
-        background: linear-gradient(180deg, #1a1f3a 0%, #232d4a 100%);
-        border-right: 1px solid var(--border-color);
-    }
-    
-    .stSidebar .stMarkdown {
-        color: var(--text-primary);
-    }
-    
-    .stSidebar [data-testid="stMarkdownContainer"] {
-        color: var(--text-secondary);
-    }
-    
-    /* Info Boxes */
-    .info-box {
-        background: linear-gradient(135deg, rgba(59, 130, 246, 0.1) 0%, rgba(59, 130, 246, 0.05) 100%);
-        border-left: 4px solid #3b82f6;
-        padding: 1.25rem;
-        border-radius: 8px;
-        color: #93c5fd;
-        font-size: 0.95rem;
-    }
-    
-    /* Metrics */
-    .stMetric {
-        background: linear-gradient(135deg, #1a1f3a 0%, #232d4a 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        border: 1px solid var(--border-color);
-    }
-    
-    [data-testid="metric-container"] {
-        background: linear-gradient(135deg, #1a1f3a 0%, #232d4a 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        border: 1px solid var(--border-color);
-    }
-    
-    [data-testid="metric-container"] [data-testid="stMetricLabel"] {
-        color: var(--text-muted);
-        font-size: 0.8rem;
-    }
-    
-    [data-testid="metric-container"] [data-testid="stMetricValue"] {
-        color: var(--accent-primary);
-        font-size: 1.8rem;
-    }
-    
-    /* Expanders */
-    .streamlit-expanderHeader {
-        background: linear-gradient(135deg, #1a1f3a 0%, #232d4a 100%);
-        border: 1px solid var(--border-color);
-        border-radius: 8px;
-        color: var(--text-primary);
-    }
-    
-    .streamlit-expanderHeader:hover {
-        border-color: rgba(239, 68, 68, 0.3);
-    }
-    
-    .streamlit-expanderContent {
-        background: linear-gradient(135deg, #232d4a 0%, #1a1f3a 100%);
-        border: 1px solid var(--border-color);
-        border-top: none;
-        border-radius: 0 0 8px 8px;
-        padding: 1rem;
-    }
-    
-    /* Data Frame */
-    .stDataFrame {
-        border-radius: 8px;
-        overflow: hidden;
-    }
-    
-    [data-testid="stDataFrame"] {
-        background: linear-gradient(135deg, #1a1f3a 0%, #232d4a 100%);
-    }
-    
-    /* Progress Bar */
-    .stProgress > div > div > div > div {
-        background-color: var(--accent-primary);
-        border-radius: 4px;
-    }
-    
-    .stProgress > div > div > div {
-        background-color: var(--bg-tertiary);
-        border-radius: 4px;
-        border: 1px solid var(--border-color);
-    }
-    
-    /* Alert & Warning boxes */
-    [data-testid="stAlert"] {
-        background: linear-gradient(135deg, rgba(239, 68, 68, 0.1) 0%, rgba(239, 68, 68, 0.05) 100%);
-        border: 1px solid rgba(239, 68, 68, 0.3);
-        border-radius: 8px;
-        color: #fca5a5;
-    }
-    
-    /* Divider */
-    hr {
-        border: none;
-        height: 1px;
-        background: linear-gradient(90deg, transparent, var(--border-color), transparent);
-        margin: 2rem 0;
-    }
-    
-    /* Text Adjustments */
-    h1, h2, h3, h4, h5, h6 {
-        color: var(--text-primary) !important;
-    }
-    
-    p, label, span {
-        color: var(--text-secondary) !important;
-    }
-    
-    /* Links */
-    a {
-        color: #3b82f6 !important;
-    }
-    
-    a:hover {
-        color: #60a5fa !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Load the heavy modules and the model bundle while the page renders
+start_warmup()
+
+# Professional Dark Theme Medical Dashboard CSS (static/cardiodetect.css,
+# linked once with a content-versioned URL and cached by the browser)
+st.markdown(stylesheet_html(), unsafe_allow_html=True)
+record_phase('page config + CSS', time.perf_counter() - script_start)
 
 # ===============================
 # Load Model and Scaler
 # ===============================
 def load_model_and_scaler():
-    """Load trained model, scaler, and feature information"""
+    """Load trained model, scaler, and feature information (cached per process)"""
     try:
-        model = joblib.load('heart_model.pkl')
-        scaler = joblib.load('scaler.pkl')
-        feature_info = joblib.load('feature_info.pkl')
-        return model, scaler, feature_info
+        return load_bundle()
     except RecursionError:
         st.error("❌ Model recursion error - retraining...")
         st.stop()
@@ -394,30 +55,38 @@ def load_model_and_scaler():
         st.error(f"❌ Error loading model: {str(e)}")
         st.stop()
 
-# Load resources (without cache to avoid recursion)
-model, scaler, feature_info = load_model_and_scaler()
-feature_names = feature_info['feature_names'] if feature_info else []
+def load_feature_schema():
+    """Compiled feature schema in training feature order (read without the heavy imports)"""
+    try:
+        return load_schema()
+    except Exception as e:
+        st.error(f"❌ Error loading model: {str(e)}")
+        st.stop()
+
+def reset_form():
+    """Drop the patient inputs so the widgets return to their defaults"""
+    for feature in feature_names:
+        st.session_state.pop(f"input_{feature}", None)
+
+# The form only needs the feature schema; the bundle (process-wide cache,
+# reloaded only when the .pkl files change) is waited for when scoring
+schema = load_feature_schema()
+feature_names = list(schema)
 
 # ===============================
 # Page Header with Professional Design
 # ===============================
-st.markdown("""
-<div class="header-container">
-    <h1>CardioDetect</h1>
-    <p>Clinical Heart Disease Risk Assessment Platform</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(page_header("CardioDetect", "Clinical Heart Disease Risk Assessment Platform"),
+            unsafe_allow_html=True)
 
 # ===============================
 # Sidebar Information
 # ===============================
 with st.sidebar:
     st.markdown("### About")
-    st.markdown("""
-    <div class="info-box">
-    Intelligent cardiovascular risk assessment using ensemble machine learning models. Supports clinical decision-making only.
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(info_box(
+        "Intelligent cardiovascular risk assessment using ensemble machine learning models. Supports clinical decision-making only."
+    ), unsafe_allow_html=True)
     
     with st.expander("Model Details"):
         st.markdown("""
@@ -442,7 +111,9 @@ with st.sidebar:
 # ===============================
 # Main Application Tabs
 # ===============================
-tab1, tab2, tab3 = st.tabs(["🔮 Make Prediction", "📖 Instructions", "ℹ️ About"])
+tab1, tab_bulk, tab2, tab3 = st.tabs(
+    ["🔮 Make Prediction", "📂 Bulk Scoring", "📖 Instructions", "ℹ️ About"]
+)
 
 # ===============================
 # TAB 1: Make Prediction
@@ -454,123 +125,91 @@ with tab1:
 # ===============================
 # TAB 1: Make Prediction
 # ===============================
-with tab1:
-    st.markdown("""
-    <div class="section-title">
-    📋 Patient Assessment Form
-    </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-    <div class="input-section">
-    Enter the patient's medical parameters below. All fields are required for accurate assessment.
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Create input form with columns for better layout
-    col1, col2 = st.columns(2)
-    
-    input_data = {}
-    
-    # Generate input fields based on feature names
-    for idx, feature in enumerate(feature_names):
-        # Alternate between columns
-        with col1 if idx % 2 == 0 else col2:
-            # Provide friendly names for features
-            friendly_name = feature.replace('_', ' ').title()
+# Tabs with widgets are fragments: interacting with them reruns (and re-sends)
+# only the fragment, not the header, sidebar and static tabs
+@st.fragment
+def prediction_tab():
+    st.markdown(section_title("📋 Patient Assessment Form"), unsafe_allow_html=True)
+    
+    st.markdown(input_section(
+        "Enter the patient's medical parameters below. All fields are required for accurate assessment."
+    ), unsafe_allow_html=True)
+    
+    # Edits are collected client-side in a form and sent on "Analyze & Predict";
+    # live preview scores on every change instead (a risk table / cache lookup,
+    # so each widget change reruns only this fragment without extra delay)
+    live_preview = st.toggle(
+        "Live preview", key="live_preview",
+        help="Update the assessment while editing (served from the risk table / prediction cache)"
+    )
+    input_container = st.container() if live_preview else st.form("patient_form", border=False)
+    
+    with input_container:
+        # Create input form with columns for better layout
+        col1, col2 = st.columns(2)
+        
+        input_data = {}
+        
+        # Generate input fields from the compiled feature schema
+        for idx, spec in enumerate(schema.features):
+            # Alternate between columns
+            with col1 if idx % 2 == 0 else col2:
+                feature = spec['name']
+                if spec['widget'] == 'selectbox':
+                    value = st.selectbox(
+                        spec['label'], options=spec['options'],
+                        format_func=lambda x, labels=spec['option_labels']: labels[x],
+                        key=f"input_{feature}", help=spec['help']
+                    )
+                else:
+                    value = st.slider(
+                        spec['label'], min_value=spec['min'], max_value=spec['max'],
+                        value=spec['default'], step=spec['step'],
+                        key=f"input_{feature}", help=spec['help']
+                    )
             
-            # Set reasonable default values and ranges based on feature type
-            if 'age' in feature.lower():
-                value = st.slider(
-                    friendly_name, min_value=18, max_value=100, value=55,
-                    key=f"input_{feature}", help="Age in years"
-                )
-            elif 'cholesterol' in feature.lower() or 'chol' in feature.lower():
-                value = st.slider(
-                    friendly_name, min_value=100, max_value=400, value=240,
-                    key=f"input_{feature}", help="Serum cholesterol in mg/dL"
-                )
-            elif 'blood_pressure' in feature.lower() or 'trestbps' in feature.lower():
-                value = st.slider(
-                    friendly_name, min_value=80, max_value=200, value=130,
-                    key=f"input_{feature}", help="Resting blood pressure in mmHg"
-                )
-            elif 'heart_rate' in feature.lower() or 'thalach' in feature.lower():
-                value = st.slider(
-                    friendly_name, min_value=40, max_value=220, value=100,
-                    key=f"input_{feature}", help="Maximum heart rate achieved"
-                )
-            elif 'gender' in feature.lower() or 'sex' in feature.lower():
-                value = st.selectbox(
-                    friendly_name, options=[0, 1],
-                    format_func=lambda x: "Female" if x == 0 else "Male",
-                    key=f"input_{feature}"
-                )
-            elif any(x in feature.lower() for x in ['depression', 'peak', 'oldpeak']):
-                value = st.slider(
-                    friendly_name, min_value=0.0, max_value=6.0, value=1.5, step=0.1,
-                    key=f"input_{feature}", help="ST depression induced by exercise"
-                )
-            elif any(x in feature.lower() for x in ['smoking', 'diabetes', 'fatigue', 'swelling', 
-                                                      'shortness', 'palpitations', 'dizziness',
-                                                      'cold', 'high_bp', 'high_cholesterol', 
-                                                      'obesity', 'sedentary', 'family', 'stress',
-                                                      'pain', 'nausea', 'breath', 'arms']):
-                value = st.selectbox(
-                    friendly_name, options=[0, 1],
-                    format_func=lambda x: "No" if x == 0 else "Yes",
-                    key=f"input_{feature}"
-                )
+                input_data[feature] = value
+        
+        # Prediction Buttons with improved spacing
+        st.markdown("---")
+        col_btn1, col_btn2, col_spacer = st.columns([2, 2, 1])
+        
+        with col_btn1:
+            if live_preview:
+                predict_button = True
+                st.caption("Live preview on: the assessment updates as you edit.")
             else:
-                value = st.slider(
-                    friendly_name, min_value=0.0, max_value=10.0, value=5.0, step=0.5,
-                    key=f"input_{feature}"
+                predict_button = st.form_submit_button(
+                    "🔍 Analyze & Predict",
+                    use_container_width=True,
+                    type="primary"
                 )
-            
-            input_data[feature] = value
-    
-    # Prediction Buttons with improved spacing
-    st.markdown("---")
-    col_btn1, col_btn2, col_spacer = st.columns([2, 2, 1])
-    
-    with col_btn1:
-        predict_button = st.button(
-            "🔍 Analyze & Predict",
-            use_container_width=True,
-            type="primary"
-        )
-    
-    with col_btn2:
-        clear_button = st.button(
-            "🔄 Reset Form",
-            use_container_width=True
-        )
-    
-    # Handle Clear Button
-    if clear_button:
-        st.rerun()
+        
+        with col_btn2:
+            reset_button = st.button if live_preview else st.form_submit_button
+            reset_button(
+                "🔄 Reset Form",
+                use_container_width=True,
+                on_click=reset_form
+            )
     
     # ===============================
     # Make Prediction
     # ===============================
     if predict_button:
-        # Prepare input for model
-        input_df = pd.DataFrame([input_data])
+        # Prepare input for model (feature order used at training time)
+        input_row = [[input_data[feature] for feature in feature_names]]
         
-        # Scale the input
-        input_scaled = scaler.transform(input_df)
-        
-        # Make prediction
-        prediction = model.predict(input_scaled)[0]
-        prediction_proba = model.predict_proba(input_scaled)[0]
+        # Make prediction (risk table lookup, or a single scaled ensemble pass)
+        from inference import score_patients
+        bundle = load_model_and_scaler()
+        predictions, probabilities = score_patients(bundle, input_row)
+        prediction = predictions[0]
+        prediction_proba = probabilities[0]
         
         # Display Results with enhanced styling
         st.markdown("---")
-        st.markdown("""
-        <div class="section-title">
-        Assessment Results
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(section_title("Assessment Results"), unsafe_allow_html=True)
         
         col_result_left, col_result_right = st.columns([1.2, 1])
         
@@ -641,27 +280,127 @@ with tab1:
         
         # Input Parameters Summary in a professional table
         with st.expander("View Input Parameters", expanded=False):
+            import pandas as pd
             summary_df = pd.DataFrame({
                 'Parameter': [k.replace('_', ' ').title() for k in input_data.keys()],
                 'Value': list(input_data.values())
             })
             st.dataframe(summary_df, use_container_width=True, hide_index=True)
 
+with tab1:
+    prediction_tab()
+
+# ===============================
+# TAB: Bulk Scoring
+# ===============================
+@st.fragment
+def bulk_scoring_tab():
+    st.markdown(section_title("📂 Bulk Patient Scoring"), unsafe_allow_html=True)
+    
+    st.markdown(input_section(
+        f"Upload a CSV with one patient per row. Required columns: {', '.join(feature_names)}.\n"
+        "Extra columns (e.g. a patient ID) are kept in the results file."
+    ), unsafe_allow_html=True)
+    
+    uploaded_file = st.file_uploader("Patient CSV", type=["csv"], key="bulk_upload")
+    score_button = st.button(
+        "📊 Score Patients",
+        use_container_width=True,
+        type="primary",
+        disabled=uploaded_file is None
+    )
+    
+    # Score in chunks; results are kept in the session so that the download
+    # button (which triggers a rerun) does not score the file again
+    if score_button and uploaded_file is not None:
+        import pandas as pd
+        from batch_score import check_columns, score_chunk
+        bundle = load_model_and_scaler()
+        total_rows = max(uploaded_file.getvalue().count(b"\n") - 1, 1)
+        progress_bar = st.progress(0.0, text="Scoring patients...")
+        scored_chunks = []
+        invalid_rows = 0
+        try:
+            uploaded_file.seek(0)
+            for chunk in pd.read_csv(uploaded_file, chunksize=BULK_CHUNK_SIZE):
+                if not scored_chunks:
+                    check_columns(chunk.columns, feature_names)
+                scored, n_invalid = score_chunk(bundle, chunk)
+                scored_chunks.append(scored)
+                invalid_rows += n_invalid
+                rows_done = sum(len(c) for c in scored_chunks)
+                progress_bar.progress(
+                    min(rows_done / total_rows, 1.0),
+                    text=f"Scored {rows_done:,} of ~{total_rows:,} patients"
+                )
+        except ValueError as e:
+            st.error(f"❌ {e}")
+        else:
+            progress_bar.empty()
+            if scored_chunks:
+                st.session_state["bulk_results"] = {
+                    "file_name": uploaded_file.name,
+                    "scored": pd.concat(scored_chunks, ignore_index=True),
+                    "invalid_rows": invalid_rows,
+                }
+    
+    bulk_results = st.session_state.get("bulk_results")
+    if bulk_results is not None and uploaded_file is not None \
+            and bulk_results["file_name"] == uploaded_file.name:
+        import numpy as np
+        import pandas as pd
+        from inference import RISK_LEVEL_LABELS
+        scored_df = bulk_results["scored"]
+        
+        st.markdown("---")
+        st.markdown("### Cohort Summary")
+        level_counts = scored_df["risk_level"].value_counts()
+        count_cols = st.columns(4)
+        with count_cols[0]:
+            st.metric("Patients", f"{len(scored_df):,}")
+        for col, level in zip(count_cols[1:], RISK_LEVEL_LABELS):
+            with col:
+                st.metric(level, f"{int(level_counts.get(level, 0)):,}")
+        
+        if bulk_results["invalid_rows"]:
+            st.warning(
+                f"{bulk_results['invalid_rows']:,} rows had missing, non-numeric or out-of-range "
+                "values and were not scored."
+            )
+        
+        st.markdown("### Risk Distribution")
+        counts, edges = np.histogram(
+            scored_df["risk_probability"].dropna(), bins=10, range=(0.0, 1.0)
+        )
+        histogram_df = pd.DataFrame(
+            {"Patients": counts},
+            index=[f"{lo:.0%}-{hi:.0%}" for lo, hi in zip(edges[:-1], edges[1:])]
+        )
+        st.bar_chart(histogram_df)
+        
+        st.download_button(
+            "⬇️ Download Results (CSV)",
+            data=scored_df.to_csv(index=False).encode("utf-8"),
+            file_name=f"scored_{bulk_results['file_name']}",
+            mime="text/csv",
+            use_container_width=True
+        )
+        
+        with st.expander("Preview Results", expanded=False):
+            st.dataframe(scored_df.head(100), use_container_width=True, hide_index=True)
+
+with tab_bulk:
+    bulk_scoring_tab()
+
 # ===============================
 # TAB 2: Instructions
 # ===============================
 with tab2:
-    st.markdown("""
-    <div class="section-title">
-    User Guide
-    </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-    <div class="info-box">
-    Step-by-step instructions for using the cardiac risk assessment tool.
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(section_title("User Guide"), unsafe_allow_html=True)
+    
+    st.markdown(info_box(
+        "Step-by-step instructions for using the cardiac risk assessment tool."
+    ), unsafe_allow_html=True)
     
     st.markdown("### Getting Started")
     
@@ -787,17 +526,11 @@ with tab2:
 # TAB 3: About
 # ===============================
 with tab3:
-    st.markdown("""
-    <div class="section-title">
-    About CardioDetect
-    </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-    <div class="info-box">
-    Cardiovascular risk assessment platform powered by ensemble machine learning. Supports evidence-based clinical decision-making.
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(section_title("About CardioDetect"), unsafe_allow_html=True)
+    
+    st.markdown(info_box(
+        "Cardiovascular risk assessment platform powered by ensemble machine learning. Supports evidence-based clinical decision-making."
+    ), unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
@@ -966,16 +699,26 @@ with tab3:
 # Professional Footer
 # ===============================
 st.markdown("---")
-st.markdown("""
-<div style="background: linear-gradient(135deg, #1a1f3a 0%, #232d4a 100%); padding: 2rem; border-radius: 10px; text-align: center; border: 1px solid #334155; margin-top: 3rem;">
-<p style="margin: 0 0 0.5rem 0; font-size: 1rem; font-weight: 500; color: #f1f5f9;">
-CardioDetect
-</p>
-<p style="margin: 0 0 1rem 0; font-size: 0.9rem; color: #cbd5e1;">
-Clinical Heart Disease Risk Assessment Platform
-</p>
-<p style="margin: 0; font-size: 0.85rem; color: #94a3b8;">
-Educational platform only • Not a medical diagnosis • Consult healthcare professionals • Version 1.0
-</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(page_footer(
+    "CardioDetect",
+    "Clinical Heart Disease Risk Assessment Platform",
+    "Educational platform only • Not a medical diagnosis • Consult healthcare professionals • Version 1.0"
+), unsafe_allow_html=True)
+
+# ===============================
+# Startup Breakdown
+# ===============================
+record_phase('first render', time.perf_counter() - script_start)
+
+# The page is on screen; wait for the warm-up so loading errors still show up.
+# Once per session: later reruns load the bundle only when they score.
+if not st.session_state.get("model_checked"):
+    load_model_and_scaler()
+    st.session_state["model_checked"] = True
+    report_startup()
+
+with st.sidebar:
+    with st.expander("Startup Timings"):
+        st.markdown("\n".join(
+            f"- {phase}: {seconds * 1000:.0f} ms" for phase, seconds in startup_timings().items()
+        ))
@@ -9,72 +9,76 @@ import time
 
 BASE_URL = "http://localhost:5000"
 
-# Sample patient data - High risk
+# Sample patient data (the model's feature names; values sent as strings) - High risk
 HIGH_RISK_PATIENT = {
-    "age": "75",
-    "sex": "1",
-    "cp": "3",
-    "trestbps": "160",
-    "chol": "320",
-    "fbs": "1",
-    "restecg": "2",
-    "thalach": "90",
-    "exang": "1",
-    "oldpeak": "5.0",
-    "slope": "2",
-    "ca": "3",
-    "thal": "2",
-    "chest_pain_type": "3",
-    "blood_pressure": "110",
-    "cholesterol": "340",
-    "heart_rate": "85",
-    "st_depression": "8.0"
+    "Chest_Pain": "1",
+    "Shortness_of_Breath": "1",
+    "Fatigue": "1",
+    "Palpitations": "1",
+    "Dizziness": "0",
+    "Swelling": "1",
+    "Pain_Arms_Jaw_Back": "1",
+    "Cold_Sweats_Nausea": "1",
+    "High_BP": "1",
+    "High_Cholesterol": "1",
+    "Diabetes": "1",
+    "Smoking": "1",
+    "Obesity": "1",
+    "Sedentary_Lifestyle": "1",
+    "Family_History": "1",
+    "Chronic_Stress": "1",
+    "Gender": "1",
+    "Age": "75"
 }
 
 # Sample patient data - Low risk
 LOW_RISK_PATIENT = {
-    "age": "35",
-    "sex": "0",
-    "cp": "0",
-    "trestbps": "120",
-    "chol": "180",
-    "fbs": "0",
-    "restecg": "0",
-    "thalach": "160",
-    "exang": "0",
-    "oldpeak": "0.0",
-    "slope": "1",
-    "ca": "0",
-    "thal": "0",
-    "chest_pain_type": "0",
-    "blood_pressure": "80",
-    "cholesterol": "190",
-    "heart_rate": "70",
-    "st_depression": "0.0"
+    "Chest_Pain": "0",
+    "Shortness_of_Breath": "0",
+    "Fatigue": "0",
+    "Palpitations": "0",
+    "Dizziness": "0",
+    "Swelling": "0",
+    "Pain_Arms_Jaw_Back": "0",
+    "Cold_Sweats_Nausea": "0",
+    "High_BP": "0",
+    "High_Cholesterol": "0",
+    "Diabetes": "0",
+    "Smoking": "0",
+    "Obesity": "0",
+    "Sedentary_Lifestyle": "1",
+    "Family_History": "0",
+    "Chronic_Stress": "1",
+    "Gender": "0",
+    "Age": "35"
 }
 
 # Sample patient data - Moderate risk
 MODERATE_RISK_PATIENT = {
-    "age": "55",
-    "sex": "1",
-    "cp": "1",
-    "trestbps": "130",
-    "chol": "240",
-    "fbs": "0",
-    "restecg": "1",
-    "thalach": "150",
-    "exang": "0",
-    "oldpeak": "1.5",
-    "slope": "1",
-    "ca": "1",
-    "thal": "2",
-    "chest_pain_type": "1",
-    "blood_pressure": "85",
-    "cholesterol": "250",
-    "heart_rate": "75",
-    "st_depression": "0.5"
+    "Chest_Pain": "0",
+    "Shortness_of_Breath": "0",
+    "Fatigue": "1",
+    "Palpitations": "0",
+    "Dizziness": "0",
+    "Swelling": "0",
+    "Pain_Arms_Jaw_Back": "0",
+    "Cold_Sweats_Nausea": "0",
+    "High_BP": "1",
+    "High_Cholesterol": "1",
+    "Diabetes": "0",
+    "Smoking": "1",
+    "Obesity": "0",
+    "Sedentary_Lifestyle": "1",
+    "Family_History": "1",
+    "Chronic_Stress": "0",
+    "Gender": "1",
+    "Age": "55"
 }
 
+# Misspelled key: must be rejected, not scored as symptom-free
+INVALID_PATIENT = dict(HIGH_RISK_PATIENT, Chest_Pian="1")
+del INVALID_PATIENT["Chest_Pain"]
+
 
 def test_health_endpoint():
     """Test health check endpoint"""
@@ -97,8 +101,8 @@ def test_health_endpoint():
         return False
 
 
-def test_prediction(patient_data, patient_name):
-    """Test prediction endpoint with patient data"""
+def test_prediction(patient_data, patient_name, expected_prediction=None):
+    """Test prediction endpoint with patient data (and the expected 0/1 prediction, if given)"""
     print(f"\n{'='*60}")
     print(f"Testing Prediction - {patient_name}")
     print("="*60)
@@ -131,6 +135,31 @@ def test_prediction(patient_data, patient_name):
         print(f"  Diseased: {data['probabilities']['diseased']}%")
         print(f"\nSHAP Plot Generated: {bool(data['shap_plot'])}")
         
+        if expected_prediction is not None and data['prediction'] != expected_prediction:
+            print(f"✗ Expected prediction {expected_prediction}, got {data['prediction']}")
+            return False
+        return True
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        return False
+
+
+def test_invalid_patient():
+    """Test that a record with an unknown (misspelled) feature key is rejected"""
+    print(f"\n{'='*60}")
+    print("Testing Rejection - Misspelled Feature Key")
+    print("="*60)
+    
+    try:
+        response = requests.post(f"{BASE_URL}/api/predict", json=INVALID_PATIENT, timeout=10)
+        data = response.json()
+        
+        if response.status_code != 400 or 'Chest_Pian' not in data.get('error', ''):
+            print(f"✗ Expected HTTP 400 naming 'Chest_Pian', got HTTP {response.status_code}: {data}")
+            return False
+        
+        print(f"✓ Status Code: {response.status_code}")
+        print(f"✓ Error: {data['error']}")
         return True
     except Exception as e:
         print(f"✗ Error: {e}")
@@ -190,13 +219,16 @@ def run_all_tests():
     time.sleep(1)
     
     # Test predictions
-    results.append(("Low Risk Patient", test_prediction(LOW_RISK_PATIENT, "Low Risk Patient")))
+    results.append(("Low Risk Patient", test_prediction(LOW_RISK_PATIENT, "Low Risk Patient", 0)))
     time.sleep(1)
     
     results.append(("Moderate Risk Patient", test_prediction(MODERATE_RISK_PATIENT, "Moderate Risk Patient")))
     time.sleep(1)
     
-    results.append(("High Risk Patient", test_prediction(HIGH_RISK_PATIENT, "High Risk Patient")))
+    results.append(("High Risk Patient", test_prediction(HIGH_RISK_PATIENT, "High Risk Patient", 1)))
+    time.sleep(1)
+    
+    results.append(("Misspelled Feature Key", test_invalid_patient()))
     
     # Summary
     print("\n" + "="*60)
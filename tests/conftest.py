@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feature_schema import FeatureSchema  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def schema():
+    """The tracked feature schema (17 binary features, Age 18-100)"""
+    return FeatureSchema.load(os.path.join(ROOT, 'feature_schema.json'))
+
+
+@pytest.fixture
+def patient(schema):
+    """A valid record with every feature, values as the API receives them"""
+    record = {name: 0 for name in schema}
+    record.update(Chest_Pain=1, Smoking=1, Age=55)
+    return record
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from batch_score import RESULT_TYPES, score_file
+
+FEATURES = ['Chest_Pain', 'Age']
+
+
+@pytest.fixture
+def header_only(tmp_path):
+    path = tmp_path / 'patients.csv'
+    path.write_text('patient_id,Chest_Pain,Age\n')
+    return path
+
+
+def test_header_only_csv_writes_header_only_output(header_only, tmp_path):
+    output = tmp_path / 'scored.csv'
+    summary = score_file(str(header_only), str(output), bundle={'feature_names': FEATURES})
+    assert summary['rows'] == 0
+    assert output.read_text().strip().split(',') == ['patient_id', 'Chest_Pain', 'Age',
+                                                     *RESULT_TYPES]
+
+
+def test_header_only_parquet_writes_schema_only_output(header_only, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    source = tmp_path / 'patients.parquet'
+    pd.read_csv(header_only).to_parquet(source)
+    output = tmp_path / 'scored.parquet'
+    score_file(str(source), str(output), bundle={'feature_names': FEATURES})
+    table = pq.read_table(output)
+    assert table.num_rows == 0
+    assert table.schema.names == ['patient_id', 'Chest_Pain', 'Age', *RESULT_TYPES]
+
+
+def test_header_only_input_missing_features_is_rejected(tmp_path):
+    source = tmp_path / 'patients.csv'
+    source.write_text('patient_id,Age\n')
+    with pytest.raises(ValueError, match='Chest_Pain'):
+        score_file(str(source), str(tmp_path / 'scored.csv'), bundle={'feature_names': FEATURES})
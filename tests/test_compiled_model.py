@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('sklearn')
+pytest.importorskip('xgboost')
+
+from sklearn.ensemble import RandomForestClassifier, VotingClassifier  # noqa: E402
+from sklearn.linear_model import LogisticRegression  # noqa: E402
+from sklearn.preprocessing import StandardScaler  # noqa: E402
+from xgboost import XGBClassifier  # noqa: E402
+
+from compiled_model import (  # noqa: E402
+    compiled_predict_proba, export_compiled_model, load_compiled_model
+)
+from fold_scaler import fold_scaler_into_ensemble  # noqa: E402
+
+N_BINARY = 17
+
+
+def patients(n_rows, rng):
+    """Rows shaped like the dataset: 17 binary features, then Age"""
+    X = rng.integers(0, 2, size=(n_rows, N_BINARY + 1)).astype(np.float64)
+    X[:, -1] = rng.integers(18, 101, size=n_rows)
+    return X
+
+
+@pytest.fixture(scope='module')
+def trained(schema):
+    rng = np.random.default_rng(0)
+    X = patients(3000, rng)
+    margin = X[:, :N_BINARY] @ rng.normal(size=N_BINARY) + (X[:, -1] - 55) / 10
+    y = (margin + rng.logistic(size=len(X)) > 0).astype(int)
+
+    scaler = StandardScaler().fit(pd.DataFrame(X, columns=list(schema)))
+    model = VotingClassifier([
+        ('lr', LogisticRegression(max_iter=1000)),
+        ('rf', RandomForestClassifier(n_estimators=30, max_depth=8, random_state=0)),
+        ('xgb', XGBClassifier(n_estimators=40, max_depth=4, random_state=0)),
+    ], voting='soft').fit(scaler.transform(pd.DataFrame(X, columns=list(schema))), y)
+    X_test = patients(2000, rng)
+    expected = model.predict_proba(scaler.transform(pd.DataFrame(X_test, columns=list(schema))))
+    return model, scaler, X_test, expected
+
+
+def test_folded_model_matches_predict_proba(trained):
+    model, scaler, X_test, expected = trained
+    raw_model = fold_scaler_into_ensemble(model, scaler)
+    np.testing.assert_allclose(raw_model.predict_proba(X_test), expected, rtol=0, atol=1e-12)
+
+
+def test_compiled_model_matches_predict_proba(trained, schema, tmp_path):
+    model, scaler, X_test, expected = trained
+    raw_model = fold_scaler_into_ensemble(model, scaler)
+    path = str(tmp_path / 'compiled.npz')
+    export_compiled_model(raw_model, list(schema), 'digest', path)
+    compiled = load_compiled_model('digest', path)
+    assert compiled['classes'].tolist() == [0, 1]
+    # XGBoost sums leaf weights in float32
+    np.testing.assert_allclose(compiled_predict_proba(compiled, X_test), expected,
+                               rtol=0, atol=1e-6)
+
+
+def test_compiled_model_rejects_other_digest(trained, schema, tmp_path):
+    model, scaler, _, _ = trained
+    path = str(tmp_path / 'compiled.npz')
+    export_compiled_model(fold_scaler_into_ensemble(model, scaler), list(schema), 'digest', path)
+    assert load_compiled_model('other digest', path) is None
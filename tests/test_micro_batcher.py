@@ -0,0 +1,75 @@
+import threading
+
+import numpy as np
+import pytest
+
+from micro_batcher import MicroBatcher
+
+
+class GatedScorer:
+    """score_fn that records batch sizes and holds its first batch until released"""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, X):
+        self.batch_sizes.append(len(X))
+        self.entered.set()
+        self.release.wait(5)
+        positive = X[:, 0] / 100.0
+        return (positive >= 0.5).astype(int), np.column_stack([1.0 - positive, positive])
+
+
+def row(value):
+    return np.array([[value, 1.0]])
+
+
+def test_queued_rows_are_scored_in_one_batch():
+    scorer = GatedScorer()
+    batcher = MicroBatcher(scorer, window_ms=50)
+    first = batcher.submit(row(10))
+    assert scorer.entered.wait(5)
+    # queued while the worker is busy with the first batch
+    futures = [batcher.submit(row(value)) for value in (20, 70, 40, 90)]
+    scorer.release.set()
+
+    assert first.result(5)[0] == 0
+    results = [future.result(5) for future in futures]
+    assert scorer.batch_sizes == [1, 4]
+    assert [label for label, _ in results] == [0, 1, 0, 1]
+    np.testing.assert_allclose([proba[1] for _, proba in results], [0.2, 0.7, 0.4, 0.9])
+    assert batcher.stats() == {'batches': 2, 'rows': 5, 'mean_batch_size': 2.5}
+
+
+def test_batches_are_capped_at_max_batch_size():
+    scorer = GatedScorer()
+    batcher = MicroBatcher(scorer, window_ms=50, max_batch_size=2)
+    first = batcher.submit(row(10))
+    assert scorer.entered.wait(5)
+    futures = [batcher.submit(row(value)) for value in (20, 30, 40)]
+    scorer.release.set()
+    for future in [first] + futures:
+        future.result(5)
+    assert scorer.batch_sizes == [1, 2, 1]
+
+
+def test_scoring_errors_reach_every_caller():
+    def failing(X):
+        raise ValueError('bad batch')
+
+    batcher = MicroBatcher(failing, window_ms=50)
+    futures = [batcher.submit(row(value)) for value in (10, 20)]
+    for future in futures:
+        with pytest.raises(ValueError, match='bad batch'):
+            future.result(5)
+    assert batcher.stats()['batches'] == 0
+
+
+def test_predict_blocks_for_the_result():
+    scorer = GatedScorer()
+    scorer.release.set()
+    label, proba = MicroBatcher(scorer, window_ms=1).predict(row(80), timeout=5)
+    assert label == 1
+    np.testing.assert_allclose(proba, [0.2, 0.8])
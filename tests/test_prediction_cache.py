@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+import prediction_cache
+from feature_encoding import pack_features, patient_keys
+from feature_schema import build_feature_schema
+from inference import score_patients
+from prediction_cache import PredictionCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic() for the cache"""
+    now = [1000.0]
+    monkeypatch.setattr(prediction_cache.time, 'monotonic', lambda: now[0])
+    return now
+
+
+class CountingModel:
+    """Stands in for the folded ensemble: P(disease) is the row sum / 100"""
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self):
+        self.rows = 0
+
+    def predict_proba(self, X):
+        self.rows += len(X)
+        positive = np.asarray(X).sum(axis=1) / 100.0
+        return np.column_stack([1.0 - positive, positive])
+
+
+def keys(*values):
+    return np.array(values, dtype=np.int64)
+
+
+def test_get_many_returns_stored_values_and_counts_hits():
+    cache = PredictionCache()
+    cache.put_many(keys(1, 2), np.array([0.1, 0.2]))
+    values, found = cache.get_many(keys(2, 3, 1))
+    assert found.tolist() == [True, False, True]
+    np.testing.assert_array_equal(values[found], [0.2, 0.1])
+    assert np.isnan(values[1])
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 1, 2)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_entries=2)
+    cache.put_many(keys(1, 2), np.array([0.1, 0.2]))
+    cache.get_many(keys(1))  # 2 is now the least recently used
+    cache.put_many(keys(3), np.array([0.3]))
+    _, found = cache.get_many(keys(1, 2, 3))
+    assert found.tolist() == [True, False, True]
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(ttl_seconds=10)
+    cache.put_many(keys(1), np.array([0.5]))
+    clock[0] += 10
+    assert cache.get_many(keys(1))[1].tolist() == [True]
+    clock[0] += 1
+    assert cache.get_many(keys(1))[1].tolist() == [False]
+    assert cache.stats()['size'] == 0
+
+
+def test_clear_drops_entries_and_counters():
+    cache = PredictionCache()
+    cache.put_many(keys(1), np.array([0.5]))
+    cache.get_many(keys(1, 2))
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'size': 0,
+                             'max_entries': cache.max_entries}
+
+
+def test_patient_keys_are_canonical(schema, patient):
+    X = np.array([[patient[name] for name in schema]] * 2, dtype=np.float64)
+    X[1, 0] = 0.5  # not a 0/1 value: no canonical key
+    patient_key, valid = patient_keys(X, schema)
+    assert valid.tolist() == [True, False]
+    bits, ages, _ = pack_features(X[:1], schema)
+    assert patient_key[0] == (55 << 17) | bits[0]
+
+
+@pytest.fixture
+def raw_schema():
+    """A layout with a continuous feature the bitmask cannot hold"""
+    stats = {'binary': [True, False, False], 'integer': [True, False, True],
+             'min': [0, 90.0, 20], 'max': [1, 180.0, 90]}
+    settings = {'MIN_BP': 80, 'MAX_BP': 200, 'MIN_AGE': 18, 'MAX_AGE': 100}
+    return build_feature_schema(['Chest_Pain', 'Blood_Pressure', 'Age'], 'target',
+                                stats, settings)
+
+
+def test_rows_with_continuous_features_get_no_key(raw_schema):
+    X = np.array([[1, 120.0, 50], [1, 140.0, 50]])
+    keys_, valid = patient_keys(X, raw_schema)
+    assert valid.tolist() == [False, False]
+
+
+def test_rows_with_continuous_features_are_never_cached(raw_schema):
+    model = CountingModel()
+    bundle = {'feature_names': list(raw_schema), 'feature_schema': raw_schema,
+              'model': model, 'raw_model': model, 'prediction_cache': PredictionCache()}
+    X = np.array([[1, 120.0, 50], [1, 140.0, 50]])
+    for _ in range(2):
+        _, proba = score_patients(bundle, X)
+        # same bits and age, different blood pressure: never served from one entry
+        np.testing.assert_allclose(proba[:, 1], [1.71, 1.91])
+    assert model.rows == 4
+    assert bundle['prediction_cache'].stats()['size'] == 0
+
+
+def test_repeated_patients_are_served_from_the_cache(schema, patient):
+    model = CountingModel()
+    bundle = {'feature_names': list(schema), 'feature_schema': schema,
+              'model': model, 'raw_model': model, 'prediction_cache': PredictionCache()}
+    X = np.array([[patient[name] for name in schema]], dtype=np.float64)
+    first = score_patients(bundle, X)[1]
+    second = score_patients(bundle, X)[1]
+    np.testing.assert_array_equal(first, second)
+    assert model.rows == 1
+    assert bundle['prediction_cache'].stats()['hits'] == 1
@@ -0,0 +1,83 @@
+import json
+
+import numpy as np
+import pytest
+
+from risk_table import build_risk_table, load_risk_table, lookup_risk
+
+FEATURES = ['Smoking', 'Chest_Pain', 'Age']
+
+
+class IdentityScaler:
+    def transform(self, frame):
+        return frame.to_numpy()
+
+
+class LinearModel:
+    """P(disease) = 0.1 Smoking + 0.2 Chest_Pain + Age / 1000, exactly 0.5 for (1, 1, 200)"""
+
+    def predict_proba(self, X):
+        positive = 0.1 * X[:, 0] + 0.2 * X[:, 1] + X[:, 2] / 1000.0
+        return np.column_stack([1.0 - positive, positive])
+
+
+@pytest.fixture
+def table_paths(tmp_path):
+    return {'table_path': str(tmp_path / 'risk.npy'), 'meta_path': str(tmp_path / 'risk.json')}
+
+
+@pytest.fixture
+def risk_table(table_paths):
+    build_risk_table(LinearModel(), IdentityScaler(), FEATURES, 'digest',
+                     min_age=40, max_age=60, **table_paths)
+    return load_risk_table('digest', FEATURES, **table_paths)
+
+
+def test_lookup_matches_the_model(risk_table):
+    X = np.array([[0, 0, 40], [1, 0, 50], [0, 1, 55], [1, 1, 60]], dtype=np.float64)
+    proba, hit = lookup_risk(risk_table, X)
+    assert hit.all()
+    np.testing.assert_allclose(proba, LinearModel().predict_proba(X)[:, 1], atol=1e-7)
+
+
+def test_rows_outside_the_table_miss(risk_table):
+    X = np.array([[1, 0, 39], [1, 0, 61], [0.5, 0, 50], [1, 0, 50.5], [1, 0, 50]])
+    proba, hit = lookup_risk(risk_table, X)
+    assert hit.tolist() == [False, False, False, False, True]
+    assert np.isnan(proba[:4]).all()
+
+
+def test_values_at_the_threshold_go_to_the_model(table_paths):
+    build_risk_table(LinearModel(), IdentityScaler(), FEATURES, 'digest',
+                     min_age=199, max_age=201, **table_paths)
+    risk_table = load_risk_table('digest', FEATURES, **table_paths)
+    proba, hit = lookup_risk(risk_table, np.array([[1, 1, 200], [0, 0, 200]], dtype=np.float64))
+    assert hit.tolist() == [False, True]
+    assert np.isnan(proba[0])
+
+
+def test_table_is_rejected_for_another_model_or_layout(risk_table, table_paths):
+    assert load_risk_table('other digest', FEATURES, **table_paths) is None
+    assert load_risk_table('digest', ['Chest_Pain', 'Smoking', 'Age'], **table_paths) is None
+
+
+def test_schema_table_lookup_and_bit_order(schema, patient, tmp_path):
+    paths = {'table_path': str(tmp_path / 'risk.npy'), 'meta_path': str(tmp_path / 'risk.json')}
+    build_risk_table(LinearModel(), IdentityScaler(), schema, 'digest',
+                     min_age=55, max_age=55, **paths)
+    risk_table = load_risk_table('digest', schema, **paths)
+    X = np.array([[patient[name] for name in schema]], dtype=np.float64)
+    proba, hit = lookup_risk(risk_table, X)
+    assert hit.all()
+    np.testing.assert_allclose(proba, LinearModel().predict_proba(X)[:, 1], atol=1e-7)
+
+    with open(paths['meta_path']) as f:
+        meta = json.load(f)
+    meta['bit_features'] = meta['bit_features'][::-1]
+    with open(paths['meta_path'], 'w') as f:
+        json.dump(meta, f)
+    assert load_risk_table('digest', schema, **paths) is None
+
+
+def test_missing_table_is_none(table_paths):
+    assert load_risk_table('digest', FEATURES, **table_paths) is None
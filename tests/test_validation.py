@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from validation import error_messages, validate_records, validate_values
+
+
+def check(records, schema, **kwargs):
+    result = validate_records(records, schema, **kwargs)
+    return result, error_messages(result, schema)
+
+
+def test_numeric_strings_are_coerced(schema, patient):
+    record = {name: str(value) for name, value in patient.items()}
+    record['Age'] = '55.0'
+    result, messages = check([record], schema)
+    assert result['valid'].tolist() == [True]
+    assert messages == [None]
+    expected = np.array([patient[name] for name in schema], dtype=np.float64)
+    np.testing.assert_array_equal(result['X'][0], expected)
+
+
+def test_keys_match_names_and_aliases_case_insensitively(schema, patient):
+    record = {name.lower(): value for name, value in patient.items()}
+    record['SEX'] = record.pop('gender')
+    result, _ = check([record], schema)
+    assert result['valid'].tolist() == [True]
+
+
+def test_non_object_record(schema):
+    result, messages = check([[1, 2, 3]], schema)
+    assert result['errors']['not_object'].tolist() == [True]
+    assert messages == ["Patient record must be a JSON object"]
+
+
+def test_unknown_key(schema, patient):
+    record = dict(patient, Chest_Pian=1)
+    del record['Chest_Pain']
+    result, messages = check([record], schema)
+    assert result['unknown_keys'] == {0: ['Chest_Pian']}
+    assert result['errors']['unknown_key'].tolist() == [True]
+    assert messages == ["Unknown feature keys: 'Chest_Pian' (see /api/feature-info)"]
+
+
+def test_missing_age(schema, patient):
+    del patient['Age']
+    result, messages = check([patient], schema)
+    assert result['errors']['missing'].tolist() == [True]
+    assert messages == ["Missing required features: Age"]
+
+
+def test_absent_symptoms_are_missing_unless_defaulted(schema, patient):
+    del patient['Smoking']
+    _, messages = check([patient], schema)
+    assert messages == ["Missing required features: Smoking"]
+
+    result, messages = check([patient], schema, fill_defaults=True)
+    assert messages == [None]
+    assert [schema[idx] for idx in np.flatnonzero(result['defaulted'][0])] == ['Smoking']
+    assert result['X'][0, list(schema).index('Smoking')] == 0.0
+
+
+def test_age_out_of_range(schema, patient):
+    patient['Age'] = 130
+    result, messages = check([patient], schema)
+    assert result['errors']['out_of_range'].tolist() == [True]
+    assert messages == ["'Age' must be between 18 and 100"]
+
+
+def test_binary_feature_not_0_or_1(schema, patient):
+    patient['Diabetes'] = 2
+    result, messages = check([patient], schema)
+    assert result['errors']['not_binary'].tolist() == [True]
+    assert messages == ["Symptom and risk-factor features must be 0 or 1"]
+
+
+def test_mixed_batch_reports_each_row(schema, patient):
+    records = [
+        patient,
+        'not a record',
+        dict(patient, Age='abc'),
+        {name: value for name, value in patient.items() if name != 'Age'},
+        dict(patient, Age=12),
+        dict(patient, Fatigue=0.5),
+        dict(patient, Foo=1),
+        dict(patient, Age='61'),
+    ]
+    result, messages = check(records, schema)
+    assert result['valid'].tolist() == [True, False, False, False, False, False, False, True]
+    assert messages == [
+        None,
+        "Patient record must be a JSON object",
+        "Feature 'Age' must be numeric, got 'abc'",
+        "Missing required features: Age",
+        "'Age' must be between 18 and 100",
+        "Symptom and risk-factor features must be 0 or 1",
+        "Unknown feature keys: 'Foo' (see /api/feature-info)",
+        None,
+    ]
+    assert result['X'][7, -1] == 61.0
+
+
+def test_dataframe_chunk(schema, patient):
+    frame = pd.DataFrame([patient, dict(patient, Age=np.nan), dict(patient, Age=101)])
+    result = validate_values(frame[list(schema)], schema)
+    assert result['valid'].tolist() == [True, False, False]
+    assert error_messages(result, schema)[1:] == ["Missing required features: Age",
+                                                  "'Age' must be between 18 and 100"]
@@ -2,24 +2,48 @@
 Heart Disease Prediction - Model Training Pipeline
 UCI Heart Disease Dataset
 Target: Heart Disease Prediction (Binary Classification)
+
+Stages: load -> split -> scale -> SMOTE -> fit (LR, RF and XGBoost in parallel
+worker processes) -> ensemble -> evaluate -> export.
+The outputs of load, split, scale, SMOTE, tuning and each member fit are stored in
+the content-addressed artifact cache (artifact_cache.py), keyed on the dataset
+contents and the stage parameters, so a rerun only recomputes the stages whose
+inputs changed and a repeat of an earlier experiment is loaded from the cache:
+    python train_model.py                     # reuse cached stages
+    python train_model.py --force             # recompute every stage
+    python train_model.py --tune              # search hyperparameters first (tune_model.py)
+    python train_model.py --params FILE.json  # train with a saved tuning result
+    python train_model.py --streaming         # out-of-core mode (streaming_train.py)
 """
 
+import argparse
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
 import joblib
-import warnings
-from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
 from xgboost import XGBClassifier
 from sklearn.ensemble import VotingClassifier
 from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score, 
-    roc_auc_score, confusion_matrix, classification_report, roc_curve, auc
+    accuracy_score, precision_score, recall_score, f1_score,
+    roc_auc_score, confusion_matrix, classification_report
 )
+from sklearn.utils import Bunch
 from imblearn.over_sampling import SMOTE
-import matplotlib.pyplot as plt
+
+from artifact_cache import ARTIFACT_CACHE_DIR, ArtifactCache
+from compiled_model import COMPILED_MODEL_PATH, export_compiled_model
+from dataset import find_target_column, load_dataset, memory_usage_mb
+from feature_schema import FEATURE_SCHEMA_PATH, build_feature_schema, column_stats
+from fold_scaler import RAW_MODEL_PATH, export_raw_model
+from risk_table import artifact_digest
 
 warnings.filterwarnings('ignore')
 
@@ -29,223 +53,342 @@ warnings.filterwarnings('ignore')
 DATASET_PATH = 'heart.csv'
 MODEL_SAVE_PATH = 'heart_model.pkl'
 SCALER_SAVE_PATH = 'scaler.pkl'
+FEATURE_INFO_SAVE_PATH = 'feature_info.pkl'
+EXPORT_STAMP_PATH = os.path.join(ARTIFACT_CACHE_DIR, 'export.json')
+EXPORTED_PATHS = [MODEL_SAVE_PATH, SCALER_SAVE_PATH, RAW_MODEL_PATH,
+                  COMPILED_MODEL_PATH, FEATURE_INFO_SAVE_PATH, FEATURE_SCHEMA_PATH]
 RANDOM_STATE = 42
 TEST_SIZE = 0.2
 
-print("=" * 80)
-print("HEART DISEASE PREDICTION MODEL - TRAINING PIPELINE")
-print("=" * 80)
-
-# ===============================
-# Step 1: Load Dataset
-# ===============================
-print("\n[1/7] Loading dataset...")
-try:
-    df = pd.read_csv(DATASET_PATH)
-    print(f"✓ Dataset loaded: {df.shape[0]} samples, {df.shape[1]} features")
-    print(f"First few rows:\n{df.head()}")
-    print(f"\nDataset Info:\n{df.info()}")
-except FileNotFoundError:
-    print(f"✗ Error: {DATASET_PATH} not found!")
-    exit(1)
-
-# ===============================
-# Step 2: Data Preprocessing
-# ===============================
-print("\n[2/7] Data Preprocessing...")
-
-# Identify target column (assumes 'target' or heart disease related column)
-# The dataset uses different column names, so we'll handle this intelligently
-target_col = None
-for col in df.columns:
-    if 'target' in col.lower() or 'heart' in col.lower() or 'risk' in col.lower():
-        target_col = col
-        break
-
-if target_col is None:
-    # Assume last column is target
-    target_col = df.columns[-1]
-
-print(f"✓ Target column identified: '{target_col}'")
-
-X = df.drop(columns=[target_col])
-y = df[target_col]
-
-print(f"Features shape: {X.shape}")
-print(f"Target shape: {y.shape}")
-print(f"Class distribution:\n{y.value_counts()}")
-print(f"Class balance: {y.value_counts(normalize=True)}")
-
-# Handle missing values
-print("\nHandling missing values...")
-missing_before = X.isnull().sum().sum()
-X = X.fillna(X.mean())
-missing_after = X.isnull().sum().sum()
-print(f"✓ Missing values before: {missing_before}, after: {missing_after}")
-
-# Feature names for later use
-feature_names = X.columns.tolist()
-print(f"✓ Features: {feature_names}")
-
-# ===============================
-# Step 3: Train-Test Split
-# ===============================
-print("\n[3/7] Splitting data into train-test sets...")
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y
-)
-print(f"✓ Training set: {X_train.shape[0]} samples")
-print(f"✓ Testing set: {X_test.shape[0]} samples")
-print(f"✓ Training set class distribution:\n{y_train.value_counts()}")
-
-# ===============================
-# Step 4: Feature Scaling
-# ===============================
-print("\n[4/7] Feature Scaling (StandardScaler)...")
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-print(f"✓ Scaler fitted on training data")
-print(f"✓ Mean of scaled features: {X_train_scaled.mean():.6f}")
-print(f"✓ Std of scaled features: {X_train_scaled.std():.6f}")
-
-# ===============================
-# Step 5: Handle Class Imbalance with SMOTE
-# ===============================
-print("\n[5/7] Handling Class Imbalance with SMOTE...")
-smote = SMOTE(random_state=RANDOM_STATE)
-X_train_smote, y_train_smote = smote.fit_resample(X_train_scaled, y_train)
-print(f"✓ SMOTE applied")
-print(f"✓ Training set after SMOTE: {X_train_smote.shape[0]} samples")
-print(f"✓ Class distribution after SMOTE:\n{pd.Series(y_train_smote).value_counts()}")
+# Ensemble members, in VotingClassifier order
+MODEL_CLASSES = {
+    'logistic_regression': LogisticRegression,
+    'random_forest': RandomForestClassifier,
+    'xgboost': XGBClassifier,
+}
+MODEL_PARAMS = {
+    'logistic_regression': {'max_iter': 1000, 'random_state': RANDOM_STATE, 'solver': 'lbfgs'},
+    'random_forest': {'n_estimators': 100, 'max_depth': 15,
+                      'random_state': RANDOM_STATE, 'n_jobs': -1},
+    'xgboost': {'n_estimators': 100, 'max_depth': 7, 'learning_rate': 0.1,
+                'random_state': RANDOM_STATE, 'eval_metric': 'logloss'},
+}
+MODEL_LABELS = {
+    'logistic_regression': 'Logistic Regression',
+    'random_forest': 'Random Forest',
+    'xgboost': 'XGBoost',
+}
+N_STAGES = 8
 
-# ===============================
-# Step 6: Train Models
-# ===============================
-print("\n[6/7] Training Individual Models...")
-
-# Logistic Regression
-print("\n  > Training Logistic Regression...")
-lr_model = LogisticRegression(max_iter=1000, random_state=RANDOM_STATE, solver='lbfgs')
-lr_model.fit(X_train_smote, y_train_smote)
-lr_pred = lr_model.predict(X_test_scaled)
-lr_pred_proba = lr_model.predict_proba(X_test_scaled)[:, 1]
-lr_accuracy = accuracy_score(y_test, lr_pred)
-lr_f1 = f1_score(y_test, lr_pred)
-lr_auc = roc_auc_score(y_test, lr_pred_proba)
-print(f"    Accuracy: {lr_accuracy:.4f}, F1: {lr_f1:.4f}, AUC: {lr_auc:.4f}")
-
-# Random Forest
-print("\n  > Training Random Forest...")
-rf_model = RandomForestClassifier(
-    n_estimators=100, max_depth=15, random_state=RANDOM_STATE, n_jobs=-1
-)
-rf_model.fit(X_train_smote, y_train_smote)
-rf_pred = rf_model.predict(X_test_scaled)
-rf_pred_proba = rf_model.predict_proba(X_test_scaled)[:, 1]
-rf_accuracy = accuracy_score(y_test, rf_pred)
-rf_f1 = f1_score(y_test, rf_pred)
-rf_auc = roc_auc_score(y_test, rf_pred_proba)
-print(f"    Accuracy: {rf_accuracy:.4f}, F1: {rf_f1:.4f}, AUC: {rf_auc:.4f}")
-
-# XGBoost
-print("\n  > Training XGBoost...")
-xgb_model = XGBClassifier(
-    n_estimators=100, max_depth=7, learning_rate=0.1,
-    random_state=RANDOM_STATE, use_label_encoder=False, eval_metric='logloss'
-)
-xgb_model.fit(X_train_smote, y_train_smote)
-xgb_pred = xgb_model.predict(X_test_scaled)
-xgb_pred_proba = xgb_model.predict_proba(X_test_scaled)[:, 1]
-xgb_accuracy = accuracy_score(y_test, xgb_pred)
-xgb_f1 = f1_score(y_test, xgb_pred)
-xgb_auc = roc_auc_score(y_test, xgb_pred_proba)
-print(f"    Accuracy: {xgb_accuracy:.4f}, F1: {xgb_f1:.4f}, AUC: {xgb_auc:.4f}")
 
 # ===============================
-# Step 7: Soft-Voting Ensemble
+# Stages
 # ===============================
-print("\n[7/7] Creating Soft-Voting Ensemble Model...")
-ensemble_model = VotingClassifier(
-    estimators=[
-        ('logistic_regression', lr_model),
-        ('random_forest', rf_model),
-        ('xgboost', xgb_model)
-    ],
-    voting='soft'
-)
+def prepare_dataset(path=DATASET_PATH):
+    """Load the typed dataset (dataset.py) and separate features and target"""
+    df = load_dataset(path)
+    print(f"✓ Dataset loaded: {df.shape[0]} samples, {df.shape[1]} features "
+          f"({memory_usage_mb(df):.1f} MB)")
+    print(f"First few rows:\n{df.head()}")
 
-# Fit the ensemble on the same training data
-ensemble_model.fit(X_train_smote, y_train_smote)
-
-# Ensemble predictions on test set
-ensemble_pred = ensemble_model.predict(X_test_scaled)
-ensemble_pred_proba = ensemble_model.predict_proba(X_test_scaled)[:, 1]
-ensemble_accuracy = accuracy_score(y_test, ensemble_pred)
-ensemble_precision = precision_score(y_test, ensemble_pred)
-ensemble_recall = recall_score(y_test, ensemble_pred)
-ensemble_f1 = f1_score(y_test, ensemble_pred)
-ensemble_auc = roc_auc_score(y_test, ensemble_pred_proba)
-
-print(f"✓ Ensemble Model Performance on Test Set:")
-print(f"  - Accuracy:  {ensemble_accuracy:.4f}")
-print(f"  - Precision: {ensemble_precision:.4f}")
-print(f"  - Recall:    {ensemble_recall:.4f}")
-print(f"  - F1 Score:  {ensemble_f1:.4f}")
-print(f"  - AUC Score: {ensemble_auc:.4f}")
-
-# Confusion Matrix
-cm = confusion_matrix(y_test, ensemble_pred)
-print(f"\nConfusion Matrix:\n{cm}")
-print(f"True Negatives: {cm[0, 0]}, False Positives: {cm[0, 1]}")
-print(f"False Negatives: {cm[1, 0]}, True Positives: {cm[1, 1]}")
-
-# Classification Report
-print(f"\nClassification Report:")
-print(classification_report(y_test, ensemble_pred))
+    target_col = find_target_column(df.columns.tolist())
+    print(f"✓ Target column identified: '{target_col}'")
+
+    X = df.drop(columns=[target_col])
+    y = df[target_col]
+    return {'X': X, 'y': y, 'target_col': target_col, 'feature_names': X.columns.tolist()}
+
+
+def split_dataset(X, y):
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y
+    )
+    return {'X_train': X_train, 'X_test': X_test, 'y_train': y_train, 'y_test': y_test}
+
+
+def scale_features(X_train, X_test):
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+    print(f"✓ Mean of scaled features: {X_train_scaled.mean():.6f}")
+    print(f"✓ Std of scaled features: {X_train_scaled.std():.6f}")
+    return {'scaler': scaler, 'X_train': X_train_scaled, 'X_test': X_test_scaled}
+
+
+def resample_smote(X_train, y_train):
+    smote = SMOTE(random_state=RANDOM_STATE)
+    X_resampled, y_resampled = smote.fit_resample(X_train, y_train)
+    return {'X_train': X_resampled, 'y_train': np.asarray(y_resampled)}
+
+
+def fit_member(name, params, X_train, y_train):
+    """Fit one ensemble member (runs in a worker process)"""
+    model = MODEL_CLASSES[name](**params)
+    model.fit(X_train, y_train)
+    return model
+
+
+def member_threads(names, n_cpus=None):
+    """
+    Thread count per member fitted side by side: the Random Forest and XGBoost
+    split the cores between them (each alone gets all of them), so the parallel
+    fits do not oversubscribe the CPU. Logistic Regression stays single-threaded.
+    """
+    n_cpus = n_cpus or os.cpu_count() or 1
+    threaded = [name for name in names if name in ('random_forest', 'xgboost')]
+    threads = {name: 1 for name in names}
+    if len(threaded) == 2:
+        threads['random_forest'] = max(1, n_cpus // 2)
+        threads['xgboost'] = max(1, n_cpus - threads['random_forest'])
+    elif threaded:
+        threads[threaded[0]] = n_cpus
+    return threads
+
+
+def fit_members(cache, resampled, resampled_key, model_params=MODEL_PARAMS,
+                force=False, workers=None):
+    """
+    Fit every member that is not in the artifact cache, in parallel processes.
+
+    Returns ({name: fitted estimator}, {name: artifact key}) in MODEL_CLASSES order.
+    """
+    keys = {name: cache.key(f'fit_{name}', [resampled_key], model_params[name])
+            for name in MODEL_CLASSES}
+    fitted = {}
+    stale = []
+    for name in MODEL_CLASSES:
+        found, model = (False, None) if force else cache.get(keys[name])
+        if found:
+            print(f"✓ Reused cached '{MODEL_LABELS[name]}' ({keys[name][:12]})")
+            fitted[name] = model
+        else:
+            stale.append(name)
+
+    if stale:
+        print(f"  > Fitting {', '.join(MODEL_LABELS[name] for name in stale)}...")
+        X_train, y_train = resampled['X_train'], resampled['y_train']
+        # Thread counts do not change the fitted models, so they stay out of the cache keys
+        threads = member_threads(stale)
+        with ProcessPoolExecutor(max_workers=workers or len(stale)) as executor:
+            futures = {name: executor.submit(fit_member, name,
+                                             dict(model_params[name], n_jobs=threads[name]),
+                                             X_train, y_train)
+                       for name in stale}
+            for name, future in futures.items():
+                fitted[name] = future.result()
+                cache.put(keys[name], fitted[name])
+                print(f"✓ {MODEL_LABELS[name]} fitted")
+    return {name: fitted[name] for name in MODEL_CLASSES}, keys
+
+
+def build_ensemble(members, y_train, weights=None):
+    """
+    Soft-voting ensemble over already-fitted members.
+
+    VotingClassifier.fit() would clone and refit every member, so the fitted
+    attributes are set directly instead.
+    """
+    ensemble = VotingClassifier(estimators=list(members.items()), voting='soft', weights=weights)
+    ensemble.le_ = LabelEncoder().fit(y_train)
+    ensemble.classes_ = ensemble.le_.classes_
+    ensemble.estimators_ = list(members.values())
+    ensemble.named_estimators_ = Bunch(**members)
+    return ensemble
+
+
+def classification_metrics(y_test, pred, pred_proba):
+    return {
+        'pred': pred,
+        'accuracy': accuracy_score(y_test, pred),
+        'precision': precision_score(y_test, pred),
+        'recall': recall_score(y_test, pred),
+        'f1': f1_score(y_test, pred),
+        'auc': roc_auc_score(y_test, pred_proba),
+    }
+
+
+def evaluate_model(model, X_test, y_test):
+    return classification_metrics(y_test, model.predict(X_test), model.predict_proba(X_test)[:, 1])
+
+
+def print_ensemble_report(ensemble_results, y_test):
+    print(f"✓ Ensemble Model Performance on Test Set:")
+    print(f"  - Accuracy:  {ensemble_results['accuracy']:.4f}")
+    print(f"  - Precision: {ensemble_results['precision']:.4f}")
+    print(f"  - Recall:    {ensemble_results['recall']:.4f}")
+    print(f"  - F1 Score:  {ensemble_results['f1']:.4f}")
+    print(f"  - AUC Score: {ensemble_results['auc']:.4f}")
+
+    cm = confusion_matrix(y_test, ensemble_results['pred'])
+    print(f"\nConfusion Matrix:\n{cm}")
+    print(f"True Negatives: {cm[0, 0]}, False Positives: {cm[0, 1]}")
+    print(f"False Negatives: {cm[1, 0]}, True Positives: {cm[1, 1]}")
+    print(f"\nClassification Report:")
+    print(classification_report(y_test, ensemble_results['pred']))
+
+
+def print_comparison(results, feature_names):
+    print("\n" + "=" * 80)
+    print("MODEL PERFORMANCE COMPARISON")
+    print("=" * 80)
+
+    comparison_df = pd.DataFrame({
+        'Model': list(results),
+        'Accuracy': [r['accuracy'] for r in results.values()],
+        'F1 Score': [r['f1'] for r in results.values()],
+        'AUC Score': [r['auc'] for r in results.values()]
+    })
+    print(comparison_df.to_string(index=False))
+
+    print("\n" + "=" * 80)
+    print("TRAINING COMPLETE!")
+    print("=" * 80)
+    print(f"\nReady for deployment. Use 'streamlit run app.py' to start the web application.")
+    print(f"Features: {len(feature_names)}")
+    print(f"Target: Binary Classification (0: No Heart Disease, 1: Heart Disease)")
+
+
+def export_is_current(ensemble_key):
+    """True when the files on disk were exported from this exact ensemble and not changed since"""
+    if not os.path.exists(EXPORT_STAMP_PATH) or not all(map(os.path.exists, EXPORTED_PATHS)):
+        return False
+    with open(EXPORT_STAMP_PATH) as f:
+        stamp = json.load(f)
+    return (stamp.get('ensemble_key') == ensemble_key
+            and stamp.get('digest') == artifact_digest(EXPORTED_PATHS))
+
+
+def export_artifacts(ensemble_model, scaler, feature_names, target_col, feature_stats, ensemble_key):
+    joblib.dump(ensemble_model, MODEL_SAVE_PATH)
+    print(f"✓ Model saved to {MODEL_SAVE_PATH}")
+
+    joblib.dump(scaler, SCALER_SAVE_PATH)
+    print(f"✓ Scaler saved to {SCALER_SAVE_PATH}")
+
+    # Save scaler-folded model (takes raw feature vectors, no separate scaling step)
+    model_digest = artifact_digest([MODEL_SAVE_PATH, SCALER_SAVE_PATH])
+    raw_model = export_raw_model(ensemble_model, scaler, model_digest)
+    print(f"✓ Scaler-folded model saved to {RAW_MODEL_PATH}")
+
+    # Save compiled array export of the folded model (pure-NumPy serving)
+    export_compiled_model(raw_model, feature_names, model_digest)
+    print(f"✓ Compiled model saved to {COMPILED_MODEL_PATH}")
+
+    # Save feature names for app.py
+    feature_info = {
+        'feature_names': feature_names,
+        'target_column': target_col
+    }
+    joblib.dump(feature_info, FEATURE_INFO_SAVE_PATH)
+    print(f"✓ Feature information saved to {FEATURE_INFO_SAVE_PATH}")
+
+    # Save the compiled feature schema (dtype, range, widget, encoding per feature)
+    build_feature_schema(feature_names, target_col, feature_stats).save(FEATURE_SCHEMA_PATH)
+    print(f"✓ Feature schema saved to {FEATURE_SCHEMA_PATH}")
+
+    os.makedirs(ARTIFACT_CACHE_DIR, exist_ok=True)
+    with open(EXPORT_STAMP_PATH, 'w') as f:
+        json.dump({'ensemble_key': ensemble_key, 'digest': artifact_digest(EXPORTED_PATHS)}, f)
 
-# ===============================
-# Save Model and Scaler
-# ===============================
-print("\n" + "=" * 80)
-print("SAVING MODEL AND SCALER")
-print("=" * 80)
-
-# Save ensemble model
-joblib.dump(ensemble_model, MODEL_SAVE_PATH)
-print(f"✓ Model saved to {MODEL_SAVE_PATH}")
-
-# Save scaler
-joblib.dump(scaler, SCALER_SAVE_PATH)
-print(f"✓ Scaler saved to {SCALER_SAVE_PATH}")
-
-# Save feature names for app.py
-feature_info = {
-    'feature_names': feature_names,
-    'target_column': target_col
-}
-joblib.dump(feature_info, 'feature_info.pkl')
-print(f"✓ Feature information saved to feature_info.pkl")
 
 # ===============================
-# Model Comparison Summary
+# Pipeline
 # ===============================
-print("\n" + "=" * 80)
-print("MODEL PERFORMANCE COMPARISON")
-print("=" * 80)
-
-comparison_df = pd.DataFrame({
-    'Model': ['Logistic Regression', 'Random Forest', 'XGBoost', 'Ensemble (Voting)'],
-    'Accuracy': [lr_accuracy, rf_accuracy, xgb_accuracy, ensemble_accuracy],
-    'F1 Score': [lr_f1, rf_f1, xgb_f1, ensemble_f1],
-    'AUC Score': [lr_auc, rf_auc, xgb_auc, ensemble_auc]
-})
-
-print(comparison_df.to_string(index=False))
-
-print("\n" + "=" * 80)
-print("TRAINING COMPLETE!")
-print("=" * 80)
-print(f"\nReady for deployment. Use 'streamlit run app.py' to start the web application.")
-print(f"Features: {len(feature_names)}")
-print(f"Target: Binary Classification (0: No Heart Disease, 1: Heart Disease)")
+def main(force=False, workers=None, tune=False, params_path=None):
+    cache = ArtifactCache()
+    print("=" * 80)
+    print("HEART DISEASE PREDICTION MODEL - TRAINING PIPELINE")
+    print("=" * 80)
+
+    print(f"\n[1/{N_STAGES}] Loading dataset...")
+    if not os.path.exists(DATASET_PATH):
+        print(f"✗ Error: {DATASET_PATH} not found!")
+        exit(1)
+    data, load_key = cache.run('load', [artifact_digest([DATASET_PATH])], None,
+                               lambda: prepare_dataset(DATASET_PATH), force)
+    feature_names, target_col = data['feature_names'], data['target_col']
+    print(f"✓ Features: {feature_names}")
+    print(f"Class distribution:\n{data['y'].value_counts()}")
+
+    print(f"\n[2/{N_STAGES}] Splitting data into train-test sets...")
+    split, split_key = cache.run('split', [load_key],
+                                 {'test_size': TEST_SIZE, 'random_state': RANDOM_STATE},
+                                 lambda: split_dataset(data['X'], data['y']), force)
+    print(f"✓ Training set: {split['X_train'].shape[0]} samples")
+    print(f"✓ Testing set: {split['X_test'].shape[0]} samples")
+
+    print(f"\n[3/{N_STAGES}] Feature Scaling (StandardScaler)...")
+    scaled, scale_key = cache.run('scale', [split_key], None,
+                                  lambda: scale_features(split['X_train'], split['X_test']), force)
+
+    print(f"\n[4/{N_STAGES}] Handling Class Imbalance with SMOTE...")
+    resampled, smote_key = cache.run('smote', [scale_key, split_key],
+                                     {'random_state': RANDOM_STATE},
+                                     lambda: resample_smote(scaled['X_train'], split['y_train']),
+                                     force)
+    print(f"✓ Training set after SMOTE: {resampled['X_train'].shape[0]} samples")
+    print(f"✓ Class distribution after SMOTE:\n{pd.Series(resampled['y_train']).value_counts()}")
+
+    model_params, weights = MODEL_PARAMS, None
+    tuned = None
+    if tune:
+        from tune_model import save_tuned_params, tune_hyperparameters, tuning_settings
+        print("\n[tune] Searching member hyperparameters and ensemble weights...")
+        tuned, _ = cache.run('tune', [scale_key, split_key], tuning_settings(),
+                             lambda: tune_hyperparameters(scaled['X_train'], split['y_train'],
+                                                          workers), force)
+        save_tuned_params(tuned)
+    elif params_path:
+        from tune_model import load_tuned_params
+        tuned = load_tuned_params(params_path)
+    if tuned is not None:
+        model_params = {name: dict(MODEL_PARAMS[name], **tuned['params'].get(name, {}))
+                        for name in MODEL_PARAMS}
+        weights = tuned['weights']
+
+    print(f"\n[5/{N_STAGES}] Training Individual Models...")
+    members, member_keys = fit_members(cache, resampled, smote_key, model_params, force, workers)
+
+    print(f"\n[6/{N_STAGES}] Creating Soft-Voting Ensemble Model...")
+    ensemble_model = build_ensemble(members, resampled['y_train'], weights)
+    print("✓ Ensemble built from the fitted members (no refit)")
+
+    print(f"\n[7/{N_STAGES}] Evaluating on the test set...")
+    X_test, y_test = scaled['X_test'], split['y_test']
+    results = {MODEL_LABELS[name]: evaluate_model(model, X_test, y_test)
+               for name, model in members.items()}
+    ensemble_results = evaluate_model(ensemble_model, X_test, y_test)
+    results['Ensemble (Voting)'] = ensemble_results
+    print_ensemble_report(ensemble_results, y_test)
+
+    print(f"\n[8/{N_STAGES}] Saving model and scaler...")
+    ensemble_key = cache.key('ensemble', list(member_keys.values()), weights)
+    if not force and export_is_current(ensemble_key):
+        print("✓ Exported artifacts are up to date")
+    else:
+        export_artifacts(ensemble_model, scaled['scaler'], feature_names, target_col,
+                         column_stats(split['X_train']), ensemble_key)
+
+    print_comparison(results, feature_names)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Train the heart disease ensemble")
+    parser.add_argument('--force', action='store_true',
+                        help="ignore the artifact cache and recompute every stage")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for fits (default: one per member / per core)")
+    parser.add_argument('--tune', action='store_true',
+                        help="search hyperparameters and ensemble weights before training")
+    parser.add_argument('--params', default=None,
+                        help="train with a tuning result saved by --tune (tuned_params.json)")
+    parser.add_argument('--streaming', action='store_true',
+                        help="out-of-core training for datasets larger than RAM (streaming_train.py)")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="rows per chunk in --streaming mode")
+    args = parser.parse_args()
+    if args.streaming:
+        from streaming_train import STREAM_CHUNK_SIZE, main_streaming
+        main_streaming(force=args.force, chunk_size=args.chunk_size or STREAM_CHUNK_SIZE)
+    else:
+        main(force=args.force, workers=args.workers, tune=args.tune, params_path=args.params)
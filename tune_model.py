@@ -0,0 +1,222 @@
+"""
+Heart Disease Prediction - Hyperparameter Tuning
+Successive-halving search over the Random Forest and XGBoost members and the
+soft-vote weights. Candidates are scored by AUC on a validation fold carved
+out of the training set (XGBoost early-stops on it) and every finalist is
+reported with its single-patient inference latency. The cheapest finalist
+within AUC_TOLERANCE of the best AUC is selected, so a negligible AUC loss
+buys fewer / shallower trees.
+
+Run through the training pipeline, which then trains with the selection:
+    python train_model.py --tune
+"""
+
+import json
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterGrid, train_test_split
+
+from train_model import MODEL_CLASSES, MODEL_LABELS, MODEL_PARAMS, RANDOM_STATE, resample_smote
+
+# ===============================
+# Configuration
+# ===============================
+TUNED_PARAMS_PATH = 'tuned_params.json'
+VALIDATION_SIZE = 0.2
+HALVING_FACTOR = 3
+MIN_RESOURCE_FRACTION = 1 / 9
+AUC_TOLERANCE = 0.002
+EARLY_STOPPING_ROUNDS = 20
+XGB_MAX_ESTIMATORS = 400
+LATENCY_REPEATS = 30
+SEARCH_SPACES = {
+    'random_forest': {
+        'n_estimators': [25, 50, 100, 200],
+        'max_depth': [6, 10, 15, None],
+        'min_samples_leaf': [1, 5],
+    },
+    'xgboost': {
+        'max_depth': [3, 5, 7],
+        'learning_rate': [0.05, 0.1, 0.3],
+        'subsample': [0.8, 1.0],
+    },
+}
+WEIGHT_GRID = [1, 2, 3]
+
+
+def tuning_settings():
+    """Every setting the tuning result depends on, for the artifact cache key"""
+    return {
+        'search_spaces': SEARCH_SPACES,
+        'weight_grid': WEIGHT_GRID,
+        'validation_size': VALIDATION_SIZE,
+        'halving_factor': HALVING_FACTOR,
+        'min_resource_fraction': MIN_RESOURCE_FRACTION,
+        'auc_tolerance': AUC_TOLERANCE,
+        'early_stopping_rounds': EARLY_STOPPING_ROUNDS,
+        'xgb_max_estimators': XGB_MAX_ESTIMATORS,
+        'latency_repeats': LATENCY_REPEATS,
+        'model_params': MODEL_PARAMS,
+        'random_state': RANDOM_STATE,
+    }
+
+
+def measure_latency(model, X, repeats=LATENCY_REPEATS):
+    """Median milliseconds of predict_proba for a single patient row"""
+    timings = []
+    for i in range(repeats):
+        row = X[i % len(X)][None, :]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000.0)
+
+
+def fit_and_score(name, searched, X_fit, y_fit, X_val, y_val, measure=False):
+    """
+    Fit one candidate and score it on the validation fold (runs in a worker process).
+
+    XGBoost candidates train up to XGB_MAX_ESTIMATORS rounds with early stopping
+    on the validation fold; the number of rounds kept becomes their n_estimators.
+    """
+    params = dict(MODEL_PARAMS[name], **searched)
+    if name == 'random_forest':
+        params['n_jobs'] = 1  # parallelism comes from the process pool
+    if name == 'xgboost':
+        params.update(n_estimators=XGB_MAX_ESTIMATORS, early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+                      n_jobs=1)
+
+    model = MODEL_CLASSES[name](**params)
+    start = time.perf_counter()
+    if name == 'xgboost':
+        model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+    else:
+        model.fit(X_fit, y_fit)
+    fit_seconds = time.perf_counter() - start
+
+    selected = dict(searched)
+    if name == 'xgboost':
+        selected['n_estimators'] = int(model.best_iteration) + 1
+    val_proba = model.predict_proba(X_val)[:, 1]
+    return {
+        'searched': searched,
+        'params': selected,
+        'auc': float(roc_auc_score(y_val, val_proba)),
+        'fit_seconds': fit_seconds,
+        'latency_ms': measure_latency(model, X_val) if measure else None,
+        'val_proba': val_proba,
+    }
+
+
+def successive_halving(name, fit_set, validation, executor):
+    """
+    Successive halving over SEARCH_SPACES[name], with training rows as the resource.
+
+    Every rung fits all remaining candidates on a larger share of the training
+    rows and keeps the best 1/HALVING_FACTOR of them by validation AUC. The last
+    rung uses all rows, also measures latency, and returns its results.
+    """
+    X_fit, y_fit = fit_set
+    X_val, y_val = validation
+    order = np.random.default_rng(RANDOM_STATE).permutation(len(X_fit))
+    candidates = list(ParameterGrid(SEARCH_SPACES[name]))
+    fraction = MIN_RESOURCE_FRACTION
+    while True:
+        final = fraction >= 1.0
+        rows = order[:max(int(len(order) * min(fraction, 1.0)), 100)]
+        futures = [executor.submit(fit_and_score, name, searched, X_fit[rows], y_fit[rows],
+                                   X_val, y_val, final)
+                   for searched in candidates]
+        results = sorted((future.result() for future in futures), key=lambda r: -r['auc'])
+        print(f"  {MODEL_LABELS[name]}: {len(candidates)} candidates on {len(rows)} rows, "
+              f"best AUC {results[0]['auc']:.4f}")
+        if final:
+            return results
+        keep = max(1, math.ceil(len(results) / HALVING_FACTOR))
+        candidates = [result['searched'] for result in results[:keep]]
+        fraction *= HALVING_FACTOR
+
+
+def select_config(results, tolerance=AUC_TOLERANCE):
+    """Lowest-latency result whose AUC is within tolerance of the best"""
+    best_auc = max(result['auc'] for result in results)
+    eligible = [result for result in results if result['auc'] >= best_auc - tolerance]
+    return min(eligible, key=lambda result: result['latency_ms'])
+
+
+def tune_weights(val_probas, y_val):
+    """Soft-vote weights (from WEIGHT_GRID) with the best validation AUC; ties keep equal weights"""
+    names = list(val_probas)
+    best_weights, best_auc = [1] * len(names), -1.0
+    for weights in product(WEIGHT_GRID, repeat=len(names)):
+        if math.gcd(*weights) != 1:
+            continue
+        proba = sum(w * val_probas[name] for w, name in zip(weights, names)) / sum(weights)
+        auc = roc_auc_score(y_val, proba)
+        if auc > best_auc + 1e-9:
+            best_weights, best_auc = list(weights), auc
+    return best_weights, float(best_auc)
+
+
+def tune_hyperparameters(X_train, y_train, workers=None):
+    """
+    Search the RF and XGBoost members and the ensemble weights.
+
+    X_train is the scaled (pre-SMOTE) training set. A stratified validation
+    fold is held out and SMOTE is applied to the remaining rows only.
+    Returns {'params': {member: overrides}, 'weights': [...], 'report': [...]}.
+    """
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, np.asarray(y_train), test_size=VALIDATION_SIZE,
+        random_state=RANDOM_STATE, stratify=y_train
+    )
+    resampled = resample_smote(X_fit, y_fit)
+    fit_set = (resampled['X_train'], resampled['y_train'])
+
+    tuned = {}
+    report = []
+    val_probas = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for name in MODEL_CLASSES:
+            if name in SEARCH_SPACES:
+                results = successive_halving(name, fit_set, (X_val, y_val), executor)
+                chosen = select_config(results)
+            else:
+                chosen = executor.submit(fit_and_score, name, {}, *fit_set, X_val, y_val, True).result()
+                results = [chosen]
+            tuned[name] = chosen['params']
+            val_probas[name] = chosen['val_proba']
+            for result in results:
+                report.append({
+                    'model': MODEL_LABELS[name],
+                    'params': json.dumps(result['params'], sort_keys=True),
+                    'auc': round(result['auc'], 4),
+                    'latency_ms': round(result['latency_ms'], 3),
+                    'fit_seconds': round(result['fit_seconds'], 2),
+                    'selected': result is chosen,
+                })
+
+    weights, ensemble_auc = tune_weights(val_probas, y_val)
+
+    print("\nFinal-rung candidates (validation fold):")
+    print(pd.DataFrame(report).to_string(index=False))
+    for name in MODEL_CLASSES:
+        print(f"✓ {MODEL_LABELS[name]}: {tuned[name]}")
+    print(f"✓ Ensemble weights: {weights} (validation AUC {ensemble_auc:.4f})")
+    return {'params': tuned, 'weights': weights, 'report': report}
+
+
+def save_tuned_params(tuned, path=TUNED_PARAMS_PATH):
+    with open(path, 'w') as f:
+        json.dump(tuned, f, indent=2)
+
+
+def load_tuned_params(path=TUNED_PARAMS_PATH):
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,80 @@
+"""
+Heart Disease Prediction - Streamlit UI Assets
+Stylesheet link and HTML fragments for streamlit_app.py
+
+The dashboard CSS lives in static/cardiodetect.css and is served by Streamlit's
+static file serving (.streamlit/config.toml: server.enableStaticServing), so a
+rerun only sends a <link> whose URL carries the stylesheet's content hash:
+the browser fetches the file once and refetches it only after it changes.
+The URL is absolute and includes server.baseUrlPath, so it also resolves when
+the app is served under a path prefix.
+Without static serving the stylesheet is inlined as before.
+"""
+
+import functools
+import hashlib
+import os
+
+# ===============================
+# Configuration
+# ===============================
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STYLESHEET_NAME = 'cardiodetect.css'
+STATIC_URL_PATH = 'app/static'
+
+
+@functools.lru_cache(maxsize=4)
+def _read_stylesheet(path, mtime_ns):
+    """(css, version) for one version of the file on disk"""
+    with open(path, 'rb') as f:
+        css = f.read()
+    return css.decode('utf-8'), hashlib.sha256(css).hexdigest()[:12]
+
+
+def static_url(filename, base_url_path=''):
+    """Absolute URL of a file in STATIC_DIR, e.g. /dashboard/app/static/x.css for base path 'dashboard'"""
+    parts = [part for part in (base_url_path.strip('/'), STATIC_URL_PATH, filename) if part]
+    return '/' + '/'.join(parts)
+
+
+def stylesheet_html(static_serving=None, base_url_path=None):
+    """<link> to the content-versioned stylesheet, or an inline <style> without static serving"""
+    if static_serving is None or base_url_path is None:
+        import streamlit as st
+        if static_serving is None:
+            static_serving = bool(st.get_option('server.enableStaticServing'))
+        if base_url_path is None:
+            base_url_path = st.get_option('server.baseUrlPath') or ''
+    path = os.path.join(STATIC_DIR, STYLESHEET_NAME)
+    css, version = _read_stylesheet(path, os.stat(path).st_mtime_ns)
+    if static_serving:
+        href = static_url(STYLESHEET_NAME, base_url_path)
+        return f'<link rel="stylesheet" href="{href}?v={version}">'
+    return f'<style>\n{css}</style>'
+
+
+def html_block(css_class, content):
+    """<div class="css_class">content</div>"""
+    return f'<div class="{css_class}">\n{content}\n</div>'
+
+
+def section_title(title):
+    return html_block('section-title', title)
+
+
+def info_box(text):
+    return html_block('info-box', text)
+
+
+def input_section(text):
+    return html_block('input-section', text)
+
+
+def page_header(title, subtitle):
+    return html_block('header-container', f'<h1>{title}</h1>\n<p>{subtitle}</p>')
+
+
+def page_footer(title, subtitle, notice):
+    return html_block('app-footer', f'<p class="app-footer-title">{title}</p>\n'
+                                    f'<p class="app-footer-subtitle">{subtitle}</p>\n'
+                                    f'<p class="app-footer-notice">{notice}</p>')
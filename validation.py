@@ -0,0 +1,183 @@
+"""
+Heart Disease Prediction - Request Validation
+Vectorized coercion and range checks for batches of patient records
+
+A whole batch (JSON objects from the API, or a CSV chunk) is turned into one
+value matrix in model feature order and checked column-wise with NumPy
+against the feature schema (feature_schema.json, ranges from config.py):
+    - record is not a JSON object
+    - record has keys that are no model feature (misspelled or foreign names)
+    - value is not a number or numeric string ("75", "5.0")
+    - feature missing (every feature is required unless the caller opts in
+      to absent symptoms defaulting to 0, which is then reported per cell)
+    - value outside the feature's range / binary feature not 0 or 1
+Instead of raising on the first bad field, every check yields a per-row
+mask, so callers score the valid rows and report the others.
+"""
+
+from itertools import chain
+from operator import methodcaller
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# Configuration
+# ===============================
+# Checks in reporting order: a row's message comes from the first one it fails
+CHECKS = ('not_object', 'unknown_key', 'non_numeric', 'missing', 'out_of_range', 'not_binary')
+
+
+def coerce_column(column):
+    """
+    (float64 values, absent mask) of one column of numbers, booleans or numeric
+    strings; None/NaN cells are absent and anything else becomes NaN.
+
+    Numeric and well-formed string columns take a single astype() call; only
+    a column with bad values goes through pd.to_numeric(errors='coerce').
+    """
+    column = np.asarray(column)
+    absent = pd.isna(column)
+    try:
+        return column.astype(np.float64), absent
+    except (TypeError, ValueError):
+        coerced = pd.to_numeric(pd.Series(column, dtype=object), errors='coerce')
+        return coerced.to_numpy(dtype=np.float64, na_value=np.nan), absent
+
+
+def coerce_numeric(values):
+    """
+    (float64 matrix, absent mask, raw columns) of an (n_rows, n_features)
+    array or DataFrame.
+
+    A numeric frame (a parsed CSV chunk) or a well-formed object matrix is
+    converted in one call; otherwise every column goes through coerce_column().
+    """
+    if isinstance(values, pd.DataFrame):
+        columns = [values[col].to_numpy() for col in values.columns]
+        if all(column.dtype.kind in 'biuf' for column in columns):
+            X = values.to_numpy(dtype=np.float64, copy=True)
+            return X, np.isnan(X), columns
+    else:
+        values = np.asarray(values, dtype=object)
+        columns = list(values.T)
+        try:
+            return values.astype(np.float64), pd.isna(values), columns
+        except (TypeError, ValueError):
+            pass
+    X = np.empty((len(values), len(columns)), dtype=np.float64)
+    absent = np.empty(X.shape, dtype=bool)
+    for idx, column in enumerate(columns):
+        X[:, idx], absent[:, idx] = coerce_column(column)
+    return X, absent, columns
+
+
+def validate_values(values, schema, fill_defaults=False):
+    """
+    Coerce and check an (n_rows, n_features) array or DataFrame in schema
+    feature order.
+
+    Absent cells are 'missing' errors. With fill_defaults=True, absent
+    binary features (schema.required_mask is False) are taken as 0 instead
+    and flagged in 'defaulted'. Returns a dict with:
+        X         - float64 feature matrix (meaningful for the valid rows)
+        valid     - per-row mask of rows that passed every check
+        errors    - {check: per-row mask}
+        cells     - {check: per-cell mask} for the feature checks
+        defaulted - per-cell mask of the absent values filled with 0
+        columns   - the raw value columns, for error messages
+    """
+    X, absent, columns = coerce_numeric(values)
+    required = schema.required_mask if fill_defaults else np.ones(len(schema), dtype=bool)
+    low, high = schema.bounds
+    binary = schema.binary_mask
+
+    cells = {'non_numeric': ~absent & np.isnan(X), 'missing': absent & required}
+    X[absent] = 0.0
+    checked = ~absent & ~cells['non_numeric']
+    cells['out_of_range'] = checked & ~binary & ((X < low) | (X > high))
+    cells['not_binary'] = checked & binary & (X != 0) & (X != 1)
+
+    errors = {'not_object': np.zeros(len(X), dtype=bool), 'unknown_key': np.zeros(len(X), dtype=bool)}
+    errors.update((check, mask.any(axis=1)) for check, mask in cells.items())
+    valid = ~np.logical_or.reduce([errors[check] for check in CHECKS])
+    return {'X': X, 'valid': valid, 'errors': errors, 'cells': cells,
+            'defaulted': absent & ~required, 'columns': columns}
+
+
+def records_to_values(records, schema):
+    """
+    Object matrix (feature order, NaN where absent) of a list of JSON
+    records, a per-row mask of the records that are JSON objects and
+    {row: [unknown keys]} for the records with keys that match no feature.
+
+    Keys are matched to feature names and aliases case-insensitively once per
+    batch (per distinct key, not per record). When a record gives a feature
+    under several keys, the key seen last in the batch wins.
+    """
+    is_object = np.fromiter((isinstance(record, dict) for record in records),
+                            dtype=bool, count=len(records))
+    objects = [record if ok else {} for record, ok in zip(records, is_object)]
+    values = np.full((len(records), len(schema)), np.nan, dtype=object)
+    filled = set()
+    unknown = {}
+    for key in dict.fromkeys(chain.from_iterable(objects)):
+        idx = schema.lookup(key)
+        if idx is None:
+            has_key = np.fromiter(map(methodcaller('__contains__', key), objects),
+                                  dtype=bool, count=len(objects))
+            for row in np.flatnonzero(has_key).tolist():
+                unknown.setdefault(row, []).append(key)
+            continue
+        # One column per distinct key, gathered with C-level dict.get calls
+        column = np.fromiter(map(methodcaller('get', key, np.nan), objects),
+                             dtype=object, count=len(objects))
+        if idx in filled:  # the same feature under another key (name and alias)
+            column = np.where(pd.isna(column), values[:, idx], column)
+        values[:, idx] = column
+        filled.add(idx)
+    return values, is_object, unknown
+
+
+def validate_records(records, schema, fill_defaults=False):
+    """
+    validate_values() for a list of JSON records. Non-objects fail
+    'not_object' and records with keys that match no feature fail
+    'unknown_key' (listed in result['unknown_keys']).
+    """
+    values, is_object, unknown = records_to_values(records, schema)
+    result = validate_values(values, schema, fill_defaults)
+    has_unknown = np.zeros(len(records), dtype=bool)
+    has_unknown[list(unknown)] = True
+    result['errors']['not_object'] = ~is_object
+    result['errors']['unknown_key'] = has_unknown
+    result['valid'] &= is_object & ~has_unknown
+    result['unknown_keys'] = unknown
+    return result
+
+
+def error_messages(result, schema):
+    """Client-facing message per row (None for valid rows), built for the invalid rows only"""
+    messages = [None] * len(result['valid'])
+    for row in np.flatnonzero(~result['valid']):
+        check = next(check for check in CHECKS if result['errors'][check][row])
+        if check == 'not_object':
+            messages[row] = "Patient record must be a JSON object"
+            continue
+        if check == 'unknown_key':
+            keys = ', '.join(repr(key) for key in result['unknown_keys'][row])
+            messages[row] = f"Unknown feature keys: {keys} (see /api/feature-info)"
+            continue
+        idx = np.flatnonzero(result['cells'][check][row])[0]
+        spec = schema.features[idx]
+        if check == 'non_numeric':
+            messages[row] = f"Feature '{spec['name']}' must be numeric, got {result['columns'][idx][row]!r}"
+        elif check == 'missing':
+            names = ', '.join(schema.features[i]['name']
+                              for i in np.flatnonzero(result['cells'][check][row]))
+            messages[row] = f"Missing required features: {names}"
+        elif check == 'out_of_range':
+            messages[row] = f"'{spec['name']}' must be between {spec['min']} and {spec['max']}"
+        else:
+            messages[row] = "Symptom and risk-factor features must be 0 or 1"
+    return messages